@@ -2,6 +2,16 @@ from n2t.core.assembler import Assembler
 from n2t.core.compiler import Compiler
 from n2t.core.cpu_emulator.facade import Emulator
 from n2t.core.disassembler import Disassembler
+from n2t.core.script import ScriptRunner
+from n2t.core.vm_emulator import VMEmulator
 from n2t.core.vm_translator import VMTranslator
 
-__all__ = ["Assembler", "Disassembler", "VMTranslator", "Compiler", "Emulator"]
+__all__ = [
+    "Assembler",
+    "Disassembler",
+    "VMTranslator",
+    "Compiler",
+    "Emulator",
+    "ScriptRunner",
+    "VMEmulator",
+]
@@ -1,7 +1,12 @@
-from dataclasses import dataclass
+from functools import lru_cache
 
 from sympy.parsing.sympy_parser import null
 
+from n2t.core.assembler.parser import comp, dest, jump, remove_comments
+
+# distinct C-instructions remembered; generated code uses a few dozen of them
+ENCODING_CACHE_SIZE = 1024
+
 COMP_MAP = {
     "0": "0101010",
     "1": "0111111",
@@ -63,13 +68,12 @@ JUMP_MAP = {
 }
 
 
-@dataclass
-class Code:
-    def dest(self, name: str) -> str:
-        return DEST_MAP[name]
-
-    def comp(self, name: str) -> str:
-        return COMP_MAP[name]
-
-    def jump(self, name: str) -> str:
-        return JUMP_MAP[name]
+@lru_cache(maxsize=ENCODING_CACHE_SIZE)
+def encode_c_instruction(instruction: str) -> int:
+    instruction = remove_comments(instruction)
+    return (
+        0b111 << 13
+        | int(COMP_MAP[comp(instruction)], base=2) << 6
+        | int(DEST_MAP[dest(instruction)], base=2) << 3
+        | int(JUMP_MAP[jump(instruction)], base=2)
+    )
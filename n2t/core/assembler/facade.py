@@ -3,12 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable
 
-from n2t.core.assembler.code import Code
+from n2t.core.assembler.code import encode_c_instruction
 from n2t.core.assembler.parser import (
-    comp,
-    dest,
     instruction_type,
-    jump,
     remove_comments,
     string_to_binary,
     symbol,
@@ -18,30 +15,35 @@ from n2t.core.assembler.symbol_table import SymbolTable
 
 @dataclass
 class Assembler:
-    code: Code
     symbol_table: SymbolTable
 
     @classmethod
     def create(cls) -> Assembler:
-        return cls(Code(), SymbolTable())
+        return cls(SymbolTable())
 
     def assemble(self, assembly: Iterable[str]) -> Iterable[str]:
-        translations = list()
-        self.first_pass(assembly)
+        self.symbol_table.reset()
+        translations: list[str] = list()
+        # symbols that may be labels defined further down or new variables
+        forward_references: list[tuple[int, str]] = list()
         for instruction in assembly:
-            if instruction_type(instruction) == "A_INSTRUCTION":
-                translations.append(self.translate_a_instruction(instruction))
-            elif instruction_type(instruction) == "C_INSTRUCTION":
+            kind = instruction_type(instruction)
+            if kind == "A_INSTRUCTION":
+                sym = symbol(remove_comments(instruction.strip()))
+                # variables are only allocated once every label is known
+                if sym[0].isdigit() or self.symbol_table.contains(sym):
+                    translations.append(self.translate_a_instruction(instruction))
+                else:
+                    forward_references.append((len(translations), instruction))
+                    translations.append("")
+            elif kind == "C_INSTRUCTION":
                 translations.append(self.translate_c_instruction(instruction))
-        return translations
+            elif kind == "L_INSTRUCTION":
+                self.symbol_table.add_entry(symbol(instruction), len(translations))
 
-    def first_pass(self, assembly: Iterable[str]) -> None:
-        line_number = 0
-        for instruction in assembly:
-            if instruction_type(instruction) == "L_INSTRUCTION":
-                self.symbol_table.add_entry(symbol(instruction), line_number)
-            elif instruction_type(instruction) != "BLANK":
-                line_number += 1
+        for position, instruction in forward_references:
+            translations[position] = self.translate_a_instruction(instruction)
+        return translations
 
     def translate_a_instruction(self, instruction: str) -> str:
         instruction = instruction.strip()
@@ -57,15 +59,4 @@ class Assembler:
         return (16 - len(binary)) * "0" + binary
 
     def translate_c_instruction(self, instruction: str) -> str:
-        instruction = instruction.strip()
-        instruction = remove_comments(instruction)
-        destination = dest(instruction)
-        comparator = comp(instruction)
-        jmp = jump(instruction)
-
-        return (
-            "111"
-            + self.code.comp(comparator)
-            + self.code.dest(destination)
-            + self.code.jump(jmp)
-        )
+        return f"{encode_c_instruction(instruction):016b}"
@@ -389,9 +389,11 @@ class CompilationEngine:
         elif operator == "-":
             self.compilations.append(" " * 2 * self.indentation + "sub")
         elif operator == "*":
-            self.compilations.append(" " * 2 * self.indentation + "Math.multiply 2")
+            self.compilations.append(
+                " " * 2 * self.indentation + "call Math.multiply 2"
+            )
         elif operator == "/":
-            self.compilations.append(" " * 2 * self.indentation + "Math.divide 2")
+            self.compilations.append(" " * 2 * self.indentation + "call Math.divide 2")
         elif operator == "&":
             self.compilations.append(" " * 2 * self.indentation + "and")
         elif operator == "|":
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from n2t.core.assembler.code import COMP_MAP
+
+WORD_MASK = 0xFFFF
+SIGN_BIT = 0x8000
+
+# comp bits of computations that read M instead of A
+COMP_M = 0b1000000
+
+Computation = Callable[[int, int, int], int]
+
+
+def to_word(value: int) -> int:
+    return ((value + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+
+
+def _wrapped(expression: str) -> str:
+    return f"((({expression}) + {SIGN_BIT}) & {WORD_MASK}) - {SIGN_BIT}"
+
+
+# Python source of every computation over signed words a, d and m
+_EXPRESSIONS: dict[str, str] = {
+    "0": "0",
+    "1": "1",
+    "-1": "-1",
+    "D": "d",
+    "A": "a",
+    "M": "m",
+    "!D": "~d",
+    "!A": "~a",
+    "!M": "~m",
+    "-D": _wrapped("-d"),
+    "-A": _wrapped("-a"),
+    "-M": _wrapped("-m"),
+    "D+1": _wrapped("d + 1"),
+    "A+1": _wrapped("a + 1"),
+    "M+1": _wrapped("m + 1"),
+    "D-1": _wrapped("d - 1"),
+    "A-1": _wrapped("a - 1"),
+    "M-1": _wrapped("m - 1"),
+    "D+A": _wrapped("d + a"),
+    "D+M": _wrapped("d + m"),
+    "D-A": _wrapped("d - a"),
+    "D-M": _wrapped("d - m"),
+    "A-D": _wrapped("a - d"),
+    "M-D": _wrapped("m - d"),
+    "D&A": "d & a",
+    "D&M": "d & m",
+    "D|A": "d | a",
+    "D|M": "d | m",
+}
+
+EXPRESSIONS: dict[int, str] = {
+    int(COMP_MAP[name], base=2): expression for name, expression in _EXPRESSIONS.items()
+}
+
+
+def _compile(expression: str) -> Computation:
+    computation: Computation = eval(
+        compile(f"lambda a, d, m: {expression}", "<hack alu>", "eval")
+    )
+    return computation
+
+
+ALU: dict[int, Computation] = {
+    comp: _compile(expression) for comp, expression in EXPRESSIONS.items()
+}
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from n2t.core.cpu_emulator.alu import ALU, COMP_M
+from n2t.core.cpu_emulator.decoder import (
+    A_INSTRUCTION,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    JUMP_EQ,
+    JUMP_GT,
+    JUMP_LT,
+    Instruction,
+    decode,
+)
+from n2t.core.cpu_emulator.memory import RAM_SIZE, Memory
+
+Vector = np.ndarray[Any, Any]
+
+
+@dataclass
+class BatchEmulator:
+    ram: Vector
+    touched: Vector
+    a_register: Vector
+    d_register: Vector
+    index: Vector
+
+    @classmethod
+    def create(cls, rams: Sequence[Mapping[int, int]]) -> BatchEmulator:
+        instances = len(rams)
+        ram = np.zeros((instances, RAM_SIZE), dtype=np.int16)
+        for instance, cells in enumerate(rams):
+            for address, value in cells.items():
+                ram[instance, address] = value
+        return cls(
+            ram,
+            np.zeros((instances, RAM_SIZE), dtype=np.bool_),
+            np.zeros(instances, dtype=np.int64),
+            np.zeros(instances, dtype=np.int64),
+            np.zeros(instances, dtype=np.int64),
+        )
+
+    def emulate(self, assembly: Iterable[str], cycles: int) -> list[list[str]]:
+        self.run(decode(assembly), cycles)
+        return self.dump_rams()
+
+    def run(self, program: list[Instruction], cycles: int) -> None:
+        for _ in range(cycles):
+            if not self.step(program):
+                break
+
+    def step(self, program: list[Instruction]) -> bool:
+        running = np.flatnonzero(self.index < len(program))
+        if not running.size:
+            return False
+
+        indices = self.index[running]
+        order = np.argsort(indices, kind="stable")
+        indices, running = indices[order], running[order]
+        starts = np.flatnonzero(np.diff(indices, prepend=-1))
+        for start, group in zip(starts, np.split(running, starts[1:])):
+            self.execute(program[indices[start]], group)
+        return True
+
+    def execute(self, instruction: Instruction, group: Vector) -> None:
+        opcode, comp, destination, jmp = instruction
+        if opcode == A_INSTRUCTION:
+            self.a_register[group] = comp
+            self.index[group] += 1
+            return
+
+        a = self.a_register[group]
+        d = self.d_register[group]
+        m: Vector | int = 0
+        if comp & COMP_M:
+            self.touched[group, a] = True
+            m = self.ram[group, a].astype(np.int64)
+        # ALU expressions are plain arithmetic, so they work on vectors as well
+        computation: Callable[..., Any] = ALU[comp]
+        result = np.broadcast_to(computation(a, d, m), group.shape)
+
+        if destination & DEST_M:
+            self.ram[group, a] = result
+            self.touched[group, a] = True
+        if destination & DEST_A:
+            self.a_register[group] = result
+        if destination & DEST_D:
+            self.d_register[group] = result
+
+        taken = np.zeros(group.shape, dtype=np.bool_)
+        if jmp & JUMP_LT:
+            taken |= result < 0
+        if jmp & JUMP_EQ:
+            taken |= result == 0
+        if jmp & JUMP_GT:
+            taken |= result > 0
+        self.index[group] = np.where(
+            taken, self.a_register[group], self.index[group] + 1
+        )
+
+    def dump_rams(self) -> list[list[str]]:
+        return [
+            list(
+                Memory(
+                    array("h", words.tobytes()), bytearray(touched.tobytes())
+                ).json_lines()
+            )
+            for words, touched in zip(self.ram, self.touched)
+        ]
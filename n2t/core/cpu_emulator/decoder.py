@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Iterable, NamedTuple
+
+from n2t.core.assembler.code import encode_c_instruction
+from n2t.core.assembler.parser import instruction_type, remove_comments, symbol
+
+A_INSTRUCTION = 0
+C_INSTRUCTION = 1
+
+DEST_A = 0b100
+DEST_D = 0b010
+DEST_M = 0b001
+
+JUMP_LT = 0b100
+JUMP_EQ = 0b010
+JUMP_GT = 0b001
+
+
+class Instruction(NamedTuple):
+    opcode: int
+    value: int
+    dest: int = 0
+    jump: int = 0
+
+
+def decode(assembly: Iterable[str]) -> list[Instruction]:
+    program = list()
+    for line in assembly:
+        instruction = remove_comments(line.strip())
+        if instruction_type(instruction) == "A_INSTRUCTION":
+            program.append(Instruction(A_INSTRUCTION, int(symbol(instruction))))
+        elif instruction_type(instruction) == "C_INSTRUCTION":
+            program.append(decode_c_instruction(instruction))
+    return program
+
+
+def decode_words(words: Iterable[str]) -> list[Instruction]:
+    return [decode_word(int(word, base=2)) for word in words if word]
+
+
+def decode_packed(words: Iterable[int]) -> list[Instruction]:
+    return [decode_word(word) for word in words]
+
+
+def decode_c_instruction(instruction: str) -> Instruction:
+    return decode_word(encode_c_instruction(instruction))
+
+
+def decode_word(word: int) -> Instruction:
+    if not word & 0x8000:
+        return Instruction(A_INSTRUCTION, word)
+    return Instruction(
+        C_INSTRUCTION, (word >> 6) & 0b1111111, (word >> 3) & 0b111, word & 0b111
+    )
+
+
+def encode_word(instruction: Instruction) -> int:
+    opcode, value, destination, jmp = instruction
+    if opcode == A_INSTRUCTION:
+        return value
+    return 0b111 << 13 | value << 6 | destination << 3 | jmp
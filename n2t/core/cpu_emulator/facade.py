@@ -1,148 +1,374 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
-from typing import Iterable
+from typing import Iterable, Mapping
 
-from n2t.core.assembler.parser import comp, dest, instruction_type, jump, symbol
+from n2t.core.cpu_emulator.alu import ALU, COMP_M, SIGN_BIT, WORD_MASK
+from n2t.core.cpu_emulator.decoder import (
+    A_INSTRUCTION,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    JUMP_EQ,
+    JUMP_GT,
+    JUMP_LT,
+    Instruction,
+    decode,
+    decode_packed,
+    decode_words,
+)
+from n2t.core.cpu_emulator.fusion import (
+    BINARY,
+    FUSED,
+    INCREMENT_SP,
+    POP_A,
+    POP_D,
+    POP_FIXED,
+    POP_SEGMENT,
+    PUSH_CONSTANT,
+    PUSH_FIXED,
+    PUSH_SEGMENT,
+    R14,
+    SIZES,
+    fuse,
+)
+from n2t.core.cpu_emulator.halt import find_calls, find_halts
+from n2t.core.cpu_emulator.jit import BlockCache
+from n2t.core.cpu_emulator.machine import Machine, Timer
+from n2t.core.cpu_emulator.memory import Memory, RamDiff
+from n2t.core.cpu_emulator.profiler import Profile
+from n2t.core.cpu_emulator.snapshot import Snapshot, program_checksum
+from n2t.core.cpu_emulator.trace import ADDRESS_MASK, NO_WRITE, Trace
+from n2t.core.cpu_emulator.trace import FIELDS as TRACE_FIELDS
+from n2t.core.jack_os import NATIVES, JackOS
 
 
 @dataclass
-class Emulator:
-    ram: dict[int, int] = field(default_factory=dict)
+class Emulator(Machine):
+    ram: Memory = field(default_factory=Memory)
     a_register: int = 0
     d_register: int = 0
     pc_register: int = 0
-    indentation: int = 0
     index: int = 0
+    jit: bool = False
+    halted: bool = False
+    stopped: bool = False
+    program: list[Instruction] = field(default_factory=list, repr=False)
+    fused: list[Instruction] = field(default_factory=list, repr=False)
+    halts: dict[int, int] = field(default_factory=dict, repr=False)
+    block_cache: BlockCache | None = field(default=None, repr=False)
+    profile: Profile | None = field(default=None, repr=False)
+    trace: Trace | None = field(default=None, repr=False)
+    resumed_checksum: int | None = field(default=None, repr=False)
+    jack_os: JackOS | None = field(default=None, repr=False)
+    natives: dict[int, str] = field(default_factory=dict, repr=False)
+    timers: list[Timer] = field(default_factory=list, repr=False)
+    ram_diff: RamDiff = field(default_factory=RamDiff, repr=False)
 
     @classmethod
-    def create(cls) -> Emulator:
-        return cls(dict())
+    def create(
+        cls,
+        jit: bool = False,
+        profile: bool = False,
+        native_os: bool = False,
+        trace: int = 0,
+        ram: Memory | None = None,
+    ) -> Emulator:
+        ram = Memory() if ram is None else ram
+        return cls(
+            ram,
+            jit=jit,
+            profile=Profile.create(0) if profile else None,
+            trace=Trace.create(trace) if trace else None,
+            jack_os=JackOS.create(ram) if native_os else None,
+        )
+
+    def link(self, labels: Mapping[str, int]) -> None:
+        if self.jack_os is not None:
+            self.natives = {labels[name]: name for name in NATIVES if name in labels}
 
     def emulate(self, assembly: Iterable[str], cycles: int) -> Iterable[str]:
-        translations = list()
-        translations.append("{")
-        self.indentation += 1
-        translations.append(" " * 2 * self.indentation + '"RAM": {')
-        self.indentation += 1
-
-        instructions = list(assembly)
-        while cycles > 0 and self.index < len(instructions):
-            instruction = instructions[self.index]
-            if instruction_type(instruction) == "A_INSTRUCTION":
-                self.a_register = int(symbol(instruction))
-                self.pc_register += 1
-                cycles -= 1
-                self.index += 1
-            elif instruction_type(instruction) == "C_INSTRUCTION":
-                self.emulate_c_instruction(instruction)
-                self.pc_register += 1
-                cycles -= 1
-
-        c = 0
-        for i in sorted(self.ram.keys()):
-            pair = '"' + str(i) + '": ' + str(self.ram[i])
-            if c != len(self.ram) - 1:
-                pair += ","
-            translations.append(" " * 2 * self.indentation + pair)
-            c += 1
-
-        self.indentation -= 1
-        translations.append(" " * 2 * self.indentation + "}")
-        self.indentation -= 1
-        translations.append(" " * 2 * self.indentation + "}")
-        return translations
-
-    def emulate_c_instruction(self, instruction: str) -> None:
-        destination = dest(instruction)
-        comparator = comp(instruction)
-        jmp = jump(instruction)
-        result = self.compute_comp(comparator)
-        if "M" in destination:
-            self.ram[self.a_register] = result
-        if "A" in destination:
-            self.a_register = result
-        if "D" in destination:
-            self.d_register = result
-
-        if jmp != "":
-            self.emulate_jump(jmp)
-        else:
-            self.index += 1
-
-    def compute_comp(self, comparator: str) -> int:
-        ops = ["+", "-", "&", "|", "!"]
-        for op in ops:
-            if op in comparator:
-                return self.compute_operation(comparator, op)
-        if comparator == "A":
-            return self.a_register
-        elif comparator == "M":
-            if self.a_register not in self.ram.keys():
-                self.ram[self.a_register] = 0
-            return self.ram[self.a_register]
-        elif comparator == "D":
-            return self.d_register
-        else:
-            # comparator.isdigit()
-            return int(comparator)
-
-    def compute_operation(self, comparator: str, operation: str) -> int:
-        first_operand, second_operand = comparator.split(operation)
-        first_operand = self.replace_operand_with_value(first_operand)
-        second_operand = self.replace_operand_with_value(second_operand)
-        if operation == "!":
-            operation = "~"
-        result = eval(first_operand + operation + second_operand)
-        result = result & 0xFFFF
-        if result & 0x8000:
-            result -= 0x10000
-        return int(result)
-
-    def replace_operand_with_value(self, operand: str) -> str:
-        if operand == "":
-            return ""
-        if operand == "A":
-            return str(self.a_register)
-        elif operand == "D":
-            return str(self.d_register)
-        elif operand == "M":
-            if self.a_register not in self.ram.keys():
-                self.ram[self.a_register] = 0
-            return str(self.ram[self.a_register])
+        self.run(decode(assembly), cycles)
+        return self.ram.json_lines()
+
+    def emulate_hack(self, words: Iterable[str], cycles: int) -> Iterable[str]:
+        self.run(decode_words(words), cycles)
+        return self.ram.json_lines()
+
+    def emulate_packed(self, words: Iterable[int], cycles: int) -> Iterable[str]:
+        self.run(decode_packed(words), cycles)
+        return self.ram.json_lines()
+
+    def load(self, program: list[Instruction]) -> None:
+        if self.resumed_checksum not in (None, program_checksum(program)):
+            raise ValueError("Snapshot was taken from a different program")
+        self.program = program
+        self.fused = fuse(program)
+        self.halts = find_halts(program)
+        self.halts.update(find_calls(program, self.natives))
+        self.block_cache = BlockCache(program, self.halts) if self.jit else None
+        if self.profile is not None:
+            self.profile = Profile.create(len(program))
+
+    def run(self, program: list[Instruction], cycles: int) -> None:
+        if program is not self.program:
+            self.load(program)
+        self.advance(cycles)
+
+    def ended(self) -> bool:
+        return self.index >= len(self.program)
+
+    def dispatch(self, cycles: int) -> None:
+        if self.halted:
+            return
+        if self.profile is not None or self.trace is not None:
+            self.interpret_instrumented(cycles)
+        elif self.block_cache is not None:
+            self.run_blocks(self.block_cache, cycles)
         else:
-            return operand
-
-    def emulate_jump(self, jmp: str) -> None:
-        if jmp == "JMP":
-            self.index = self.a_register
-        elif jmp == "JGT":
-            if self.d_register > 0:
-                self.index = self.a_register
-            else:
-                self.index += 1
-        elif jmp == "JGE":
-            if self.d_register >= 0:
-                self.index = self.a_register
-            else:
-                self.index += 1
-        elif jmp == "JLT":
-            if self.d_register < 0:
-                self.index = self.a_register
+            self.interpret(cycles)
+
+    def run_blocks(self, blocks: BlockCache, cycles: int) -> None:
+        ram, touched = self.ram.words, self.ram.touched
+        a, d, index = self.a_register, self.d_register, self.index
+        size = len(self.program)
+        remaining = cycles
+        while index < size:
+            block = blocks[index]
+            if block.size > remaining:
+                break
+            a, d, index = block.function(ram, touched, a, d)
+            remaining -= block.size
+            if index == block.halt:
+                if index in self.natives:
+                    index = self.call_native(index)
+                    if not self.halted:
+                        continue
+                self.halted = True
+                break
+
+        self.a_register, self.d_register, self.index = a, d, index
+        self.pc_register += cycles - remaining
+        if not self.halted:
+            self.interpret(remaining)
+
+    def interpret(self, cycles: int) -> None:
+        program, original, halts = self.fused, self.program, self.halts
+        ram, touched = self.ram.words, self.ram.touched
+        a, d, index = self.a_register, self.d_register, self.index
+        size = len(program)
+        executed = 0
+        while executed < cycles and index < size:
+            opcode, comp, destination, jmp = program[index]
+            if opcode == FUSED:
+                if executed + SIZES[comp] > cycles:
+                    opcode, comp, destination, jmp = original[index]
+                else:
+                    executed += SIZES[comp]
+                    index += SIZES[comp]
+                    a, d = self.execute_fused(comp, destination, jmp, d)
+                    continue
+
+            executed += 1
+            if opcode == A_INSTRUCTION:
+                a = comp
+                index += 1
+                continue
+
+            if comp & COMP_M:
+                touched[a] = 1
+                result = ALU[comp](a, d, ram[a])
             else:
-                self.index += 1
-        elif jmp == "JLE":
-            if self.d_register <= 0:
-                self.index = self.a_register
+                result = ALU[comp](a, d, 0)
+            if destination & DEST_M:
+                ram[a] = result
+                touched[a] = 1
+            if destination & DEST_A:
+                a = result
+            if destination & DEST_D:
+                d = result
+
+            if jmp and jmp & (
+                JUMP_LT if result < 0 else JUMP_EQ if result == 0 else JUMP_GT
+            ):
+                if halts.get(index) == a:
+                    if a in self.natives:
+                        index = a = self.call_native(a)
+                        if not self.halted:
+                            continue
+                        break
+                    self.halted = True
+                    index = a
+                    break
+                index = a
             else:
-                self.index += 1
-        elif jmp == "JEQ":
-            if self.d_register == 0:
-                self.index = self.a_register
+                index += 1
+
+        self.a_register, self.d_register, self.index = a, d, index
+        self.pc_register += executed
+
+    def execute_fused(self, kind: int, x: int, y: int, d: int) -> tuple[int, int]:
+        ram, touched = self.ram.words, self.ram.touched
+        if kind <= PUSH_SEGMENT:
+            if kind == PUSH_CONSTANT:
+                d = x
+            elif kind == PUSH_FIXED:
+                touched[x] = 1
+                d = ram[x]
+            elif kind == PUSH_SEGMENT:
+                touched[x] = 1
+                address = ((ram[x] + y + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+                touched[address] = 1
+                d = ram[address]
+            sp = ram[0]
+            ram[sp] = d
+            ram[0] = ((ram[0] + 1 + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+            touched[0] = touched[sp] = 1
+            return 0, d
+
+        if kind >= POP_FIXED:
+            if kind == POP_SEGMENT:
+                touched[x] = 1
+                x = ((ram[x] + y + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+            ram[R14] = x
+            sp = ram[0] = ((ram[0] - 1 + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+            d = ram[sp]
+            a = ram[R14]
+            ram[a] = d
+            touched[0] = touched[R14] = touched[sp] = touched[a] = 1
+            return a, d
+
+        a = 0
+        if kind != INCREMENT_SP:
+            if kind == BINARY:
+                a = ram[0] = ((ram[0] - 1 + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+                touched[a] = 1
+                d = ram[a]
+            a = ram[0] = ((ram[0] - 1 + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+            touched[0] = 1
+            if kind == POP_A:
+                return a, d
+            touched[a] = 1
+            if kind == POP_D:
+                return a, ram[a]
+            ram[a] = ALU[x](a, d, ram[a])
+            a = 0
+        ram[0] = ((ram[0] + 1 + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+        touched[0] = 1
+        return a, d
+
+    def call_native(self, address: int) -> int:
+        assert self.jack_os is not None
+        index = self.jack_os.call_from_frame(self.natives[address])
+        self.halted = self.jack_os.halted
+        return index
+
+    def snapshot(self) -> bytes:
+        if self.jack_os is not None:
+            raise ValueError("Snapshots do not include the native Jack OS state")
+        return Snapshot(
+            self.a_register,
+            self.d_register,
+            self.index,
+            self.pc_register,
+            self.halted,
+            program_checksum(self.program),
+            array("h", self.ram.words),
+            bytes(self.ram.touched),
+        ).to_bytes()
+
+    def restore(self, data: bytes) -> None:
+        if self.jack_os is not None:
+            raise ValueError("Snapshots do not include the native Jack OS state")
+        snapshot = Snapshot.from_bytes(data)
+        self.a_register, self.d_register = snapshot.a_register, snapshot.d_register
+        self.index, self.pc_register = snapshot.index, snapshot.cycles
+        self.halted = snapshot.halted
+        self.ram.words[:] = snapshot.words
+        self.ram.touched[:] = snapshot.touched
+        self.resumed_checksum = snapshot.checksum
+
+    def trace_data(self) -> bytes:
+        return b"" if self.trace is None else self.trace.to_bytes()
+
+    def profile_report(self, labels: Mapping[str, int]) -> list[str]:
+        if self.profile is None:
+            return list()
+        return self.profile.report(self.program, labels)
+
+    def interpret_instrumented(self, cycles: int) -> None:
+        program, halts = self.program, self.halts
+        executions = jumps_taken = records = None
+        if self.profile is not None:
+            executions, jumps_taken = self.profile.executions, self.profile.jumps_taken
+        slot = end = 0
+        if self.trace is not None:
+            records = self.trace.records
+            slot = (self.trace.recorded % self.trace.capacity) * TRACE_FIELDS
+            end = len(records)
+        ram, touched = self.ram.words, self.ram.touched
+        a, d, index = self.a_register, self.d_register, self.index
+        size = len(program)
+        executed = 0
+        while executed < cycles and index < size:
+            opcode, comp, destination, jmp = program[index]
+            if executions is not None:
+                executions[index] += 1
+            executed += 1
+            if opcode == A_INSTRUCTION:
+                if records is not None:
+                    records[slot] = index
+                    records[slot + 1] = comp
+                    records[slot + 2] = d
+                    records[slot + 3] = NO_WRITE
+                    slot = 0 if slot + TRACE_FIELDS == end else slot + TRACE_FIELDS
+                a = comp
+                index += 1
+                continue
+
+            pc = index
+            address = NO_WRITE
+            if comp & COMP_M:
+                touched[a] = 1
+                result = ALU[comp](a, d, ram[a])
             else:
-                self.index += 1
-        elif jmp == "JNE":
-            if self.d_register != 0:
-                self.index = self.a_register
+                result = ALU[comp](a, d, 0)
+            if destination & DEST_M:
+                ram[a] = result
+                touched[a] = 1
+                address = a & ADDRESS_MASK
+            if destination & DEST_A:
+                a = result
+            if destination & DEST_D:
+                d = result
+
+            if jmp and jmp & (
+                JUMP_LT if result < 0 else JUMP_EQ if result == 0 else JUMP_GT
+            ):
+                if jumps_taken is not None:
+                    jumps_taken[index] += 1
+                if halts.get(index) != a:
+                    index = a
+                elif a in self.natives:
+                    index = a = self.call_native(a)
+                else:
+                    self.halted = True
+                    index = a
             else:
-                self.index += 1
+                index += 1
+
+            if records is not None:
+                records[slot] = pc
+                records[slot + 1] = a
+                records[slot + 2] = d
+                records[slot + 3] = address
+                records[slot + 4] = result
+                slot = 0 if slot + TRACE_FIELDS == end else slot + TRACE_FIELDS
+            if self.halted:
+                break
+
+        self.a_register, self.d_register, self.index = a, d, index
+        self.pc_register += executed
+        if self.trace is not None:
+            self.trace.recorded += executed
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from n2t.core.cpu_emulator.decoder import (
+    A_INSTRUCTION,
+    C_INSTRUCTION,
+    DEST_M,
+    Instruction,
+    decode,
+)
+
+# Superinstructions stand in for the first instruction of a known VMTranslator
+# sequence as Instruction(FUSED, kind, x, y), where x and y are the operands the
+# sequence loads. Only the first index is replaced, so jumps into the middle of
+# a sequence still run the plain instructions.
+FUSED = 2
+# VMTranslator keeps the popped segment address here
+R14 = 14
+
+PUSH_D = 0  # @SP A=M M=D @SP M=M+1
+PUSH_CONSTANT = 1  # @x D=A, PUSH_D
+PUSH_FIXED = 2  # @x D=M, PUSH_D
+PUSH_SEGMENT = 3  # @x D=M @y A=D+A D=M, PUSH_D
+POP_D = 4  # @SP M=M-1 A=M D=M
+POP_A = 5  # @SP M=M-1 A=M
+INCREMENT_SP = 6  # @SP M=M+1
+UNARY = 7  # POP_A, M=<x>, INCREMENT_SP
+BINARY = 8  # POP_D, POP_A, M=<x>, INCREMENT_SP
+POP_FIXED = 9  # @x D=A @R14 M=D, POP_D, @R14 A=M M=D
+POP_SEGMENT = 10  # @x D=M @y A=D+A D=A @R14 M=D, POP_D, @R14 A=M M=D
+
+# any A-instruction, whose value becomes an operand
+_OPERAND = Instruction(A_INSTRUCTION, -1)
+# any computation stored into M alone, whose comp bits become an operand
+_STORE = Instruction(C_INSTRUCTION, -1, DEST_M)
+
+_PUSH_D = decode(["@0", "A=M", "M=D", "@0", "M=M+1"])
+_POP_D = decode(["@0", "M=M-1", "A=M", "D=M"])
+_POP_A = _POP_D[:3]
+_INCREMENT_SP = _PUSH_D[3:]
+_ADDRESS = [_OPERAND, *decode(["D=M"]), _OPERAND, *decode(["A=D+A"])]
+_POP_TO_R14 = [
+    *decode(["D=A", f"@{R14}", "M=D"]),
+    *_POP_D,
+    *decode([f"@{R14}", "A=M", "M=D"]),
+]
+
+# longest first, so each index gets the largest sequence starting there
+_PATTERNS: list[tuple[int, list[Instruction]]] = [
+    (POP_SEGMENT, [*_ADDRESS, *_POP_TO_R14]),
+    (POP_FIXED, [_OPERAND, *_POP_TO_R14]),
+    (PUSH_SEGMENT, [*_ADDRESS, *decode(["D=M"]), *_PUSH_D]),
+    (BINARY, [*_POP_D, *_POP_A, _STORE, *_INCREMENT_SP]),
+    (PUSH_CONSTANT, [_OPERAND, *decode(["D=A"]), *_PUSH_D]),
+    (PUSH_FIXED, [_OPERAND, *decode(["D=M"]), *_PUSH_D]),
+    (UNARY, [*_POP_A, _STORE, *_INCREMENT_SP]),
+    (PUSH_D, _PUSH_D),
+    (POP_D, _POP_D),
+    (POP_A, _POP_A),
+    (INCREMENT_SP, _INCREMENT_SP),
+]
+
+# cycles each kind of superinstruction stands for
+SIZES = tuple(len(pattern) for _, pattern in sorted(_PATTERNS))
+
+
+# every pattern starts with an A-instruction and a fixed second instruction
+_CANDIDATES: dict[Instruction, list[tuple[int, list[Instruction]]]] = dict()
+for _kind, _pattern in _PATTERNS:
+    _CANDIDATES.setdefault(_pattern[1], list()).append((_kind, _pattern))
+
+
+def fuse(program: list[Instruction]) -> list[Instruction]:
+    fused = list(program)
+    for index in range(len(program) - 1):
+        if program[index].opcode != A_INSTRUCTION:
+            continue
+        for kind, pattern in _CANDIDATES.get(program[index + 1], ()):
+            operands = _match(program, index, pattern)
+            if operands is not None:
+                fused[index] = Instruction(FUSED, kind, *operands)
+                break
+    return fused
+
+
+def _match(
+    program: list[Instruction], index: int, pattern: list[Instruction]
+) -> list[int] | None:
+    if index + len(pattern) > len(program):
+        return None
+    operands = list()
+    for expected, instruction in zip(pattern, program[index : index + len(pattern)]):
+        if expected is _OPERAND:
+            if instruction.opcode != A_INSTRUCTION:
+                return None
+            operands.append(instruction.value)
+        elif expected is _STORE:
+            opcode, comp, destination, jmp = instruction
+            if opcode == A_INSTRUCTION or destination != DEST_M or jmp:
+                return None
+            operands.append(comp)
+        elif instruction != expected:
+            return None
+    return operands
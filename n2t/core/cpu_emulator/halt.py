@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Container
+
+from n2t.core.cpu_emulator.alu import COMP_M
+from n2t.core.cpu_emulator.decoder import A_INSTRUCTION, Instruction
+
+
+# A taken jump at index j to target t halts the program when nothing in [t, j)
+# writes a register or memory and the jump neither writes nor reads M: every
+# later pass repeats the same state, like the canonical (END) @END 0;JMP.
+def find_halts(program: list[Instruction]) -> dict[int, int]:
+    halts = dict()
+    for index, (opcode, comp, destination, jmp) in enumerate(program):
+        if opcode == A_INSTRUCTION or not jmp or destination or comp & COMP_M:
+            continue
+
+        target = _loaded_target(program, index)
+        if target <= index and all(map(_is_pure, program[target:index])):
+            halts[index] = target
+    return halts
+
+
+# Jumps that load one of the targets right before jumping, like a translated call
+def find_calls(program: list[Instruction], targets: Container[int]) -> dict[int, int]:
+    calls = dict()
+    for index, (opcode, _, destination, jmp) in enumerate(program):
+        if opcode == A_INSTRUCTION or not jmp or destination:
+            continue
+
+        target = _loaded_target(program, index)
+        if target in targets:
+            calls[index] = target
+    return calls
+
+
+def _loaded_target(program: list[Instruction], jump: int) -> int:
+    for index in range(jump - 1, -1, -1):
+        if not _is_pure(program[index]):
+            break
+        if program[index].opcode == A_INSTRUCTION:
+            return program[index].value
+    return jump
+
+
+def _is_pure(instruction: Instruction) -> bool:
+    return instruction.opcode == A_INSTRUCTION or not (
+        instruction.dest or instruction.jump
+    )
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, NamedTuple
+
+from n2t.core.cpu_emulator.alu import COMP_M, EXPRESSIONS
+from n2t.core.cpu_emulator.decoder import (
+    A_INSTRUCTION,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    Instruction,
+)
+from n2t.core.cpu_emulator.memory import Words
+
+# (ram, touched, a, d) -> (a, d, next index)
+BlockFunction = Callable[[Words, bytearray, int, int], tuple[int, int, int]]
+
+JUMP_ALWAYS = 0b111
+CONDITIONS = {
+    0b001: "r > 0",
+    0b010: "r == 0",
+    0b011: "r >= 0",
+    0b100: "r < 0",
+    0b101: "r != 0",
+    0b110: "r <= 0",
+}
+
+
+class Block(NamedTuple):
+    function: BlockFunction
+    size: int
+    halt: int | None = None
+
+
+@dataclass
+class BlockCache:
+    program: list[Instruction]
+    halts: dict[int, int] = field(default_factory=dict)
+    blocks: dict[int, Block] = field(default_factory=dict)
+
+    def __getitem__(self, start: int) -> Block:
+        block = self.blocks.get(start)
+        if block is None:
+            block = compile_block(self.program, start)
+            block = block._replace(halt=self.halts.get(start + block.size - 1))
+            self.blocks[start] = block
+        return block
+
+
+def compile_block(program: list[Instruction], start: int) -> Block:
+    lines = ["def block(ram, touched, a, d):"]
+    index = start
+    while index < len(program):
+        opcode, value, destination, jmp = program[index]
+        index += 1
+        if opcode == A_INSTRUCTION:
+            lines.append(f"    a = {value}")
+            continue
+
+        lines.extend(_c_instruction_source(value, destination))
+        if jmp == JUMP_ALWAYS:
+            lines.append("    return a, d, a")
+            break
+        if jmp:
+            lines.append(f"    if {CONDITIONS[jmp]}:")
+            lines.append("        return a, d, a")
+            lines.append(f"    return a, d, {index}")
+            break
+    else:
+        lines.append(f"    return a, d, {index}")
+
+    namespace: dict[str, BlockFunction] = {}
+    exec(compile("\n".join(lines), f"<hack block {start}>", "exec"), namespace)
+    return Block(namespace["block"], index - start)
+
+
+def _c_instruction_source(comp: int, destination: int) -> list[str]:
+    lines = list()
+    expression = EXPRESSIONS[comp]
+    if comp & COMP_M:
+        lines.append("    touched[a] = 1")
+        lines.append("    m = ram[a]")
+    lines.append(f"    r = {expression}")
+    if destination & DEST_M:
+        lines.append("    ram[a] = r")
+        lines.append("    touched[a] = 1")
+    if destination & DEST_A:
+        lines.append("    a = r")
+    if destination & DEST_D:
+        lines.append("    d = r")
+    return lines
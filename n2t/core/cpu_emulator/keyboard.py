@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from n2t.core.cpu_emulator.memory import KEYBOARD, Memory
+
+RELEASED = 0
+CODE_PREFIX = "code:"
+KEYS = {
+    "newline": 128,
+    "backspace": 129,
+    "left": 130,
+    "up": 131,
+    "right": 132,
+    "down": 133,
+    "home": 134,
+    "end": 135,
+    "pageup": 136,
+    "pagedown": 137,
+    "insert": 138,
+    "delete": 139,
+    "esc": 140,
+    **{f"f{number}": 140 + number for number in range(1, 13)},
+    "space": 32,
+}
+
+
+class KeyEvent(NamedTuple):
+    cycle: int
+    key: int
+
+
+@dataclass
+class Keyboard:
+    events: list[KeyEvent]
+    position: int = 0
+
+    # Every line reads `<cycle> <key> [<cycles held>]`, where the key is a single
+    # character (so 5 is the digit), a name from KEYS or a code such as 130 or
+    # code:65; without a duration the key stays pressed until the next event
+    @classmethod
+    def parse(cls, script: str) -> Keyboard:
+        events = list()
+        for number, line in enumerate(script.splitlines(), start=1):
+            fields = line.split("#")[0].split()
+            if not fields:
+                continue
+            if len(fields) > 3:
+                raise ValueError(f"Line {number}: expected <cycle> <key> [<cycles>]")
+            cycle, key = int(fields[0]), _key_code(fields[1])
+            events.append(KeyEvent(cycle, key))
+            if len(fields) == 3:
+                events.append(KeyEvent(cycle + int(fields[2]), RELEASED))
+        # a release and a press on the same cycle leave the new key pressed
+        return cls(
+            sorted(events, key=lambda event: (event.cycle, event.key != RELEASED))
+        )
+
+    @property
+    def next_cycle(self) -> int | None:
+        if self.position == len(self.events):
+            return None
+        return self.events[self.position].cycle
+
+    def press(self, ram: Memory, cycle: int) -> int | None:
+        while self.position < len(self.events):
+            event = self.events[self.position]
+            if event.cycle > cycle:
+                break
+            ram.words[KEYBOARD] = event.key
+            self.position += 1
+        return self.next_cycle
+
+
+def _key_code(key: str) -> int:
+    if key.startswith(CODE_PREFIX):
+        return int(key[len(CODE_PREFIX) :])
+    if len(key) == 1:
+        return ord(key.upper())
+    if key.isdigit():
+        return int(key)
+    if key.lower() not in KEYS:
+        raise ValueError(f"Unknown key: {key}")
+    return KEYS[key.lower()]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, NamedTuple, Sequence
+
+from n2t.core.cpu_emulator.keyboard import Keyboard
+from n2t.core.cpu_emulator.memory import Memory, RamDiff
+from n2t.core.cpu_emulator.screen import ENCODERS
+from n2t.core.jack_os import JackOS
+
+# Runs when the emulator reaches a cycle and gives the next one to run at, if any
+Action = Callable[[], "int | None"]
+
+
+class Timer(NamedTuple):
+    cycle: int
+    action: Action
+
+
+class Machine(ABC):
+    # What the CPU and VM emulators share: the clock, timers and RAM views.
+    # Each engine declares these as dataclass fields and implements dispatch.
+    ram: Memory
+    pc_register: int
+    halted: bool
+    stopped: bool
+    jack_os: JackOS | None
+    timers: list[Timer]
+    ram_diff: RamDiff
+
+    @abstractmethod
+    def dispatch(self, cycles: int) -> None:  # pragma: no cover
+        pass
+
+    def advance(self, cycles: int) -> None:
+        end = self.pc_register + cycles
+        while True:
+            target = min([end] + [timer.cycle for timer in self.timers])
+            self.dispatch(target - self.pc_register)
+            self.fire_timers()
+            if self.halted or self.stopped:
+                break
+            if self.pc_register < target or self.pc_register >= end:
+                break
+
+    def schedule(self, cycle: int, action: Action) -> None:
+        self.timers.append(Timer(cycle, action))
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def fire_timers(self) -> None:
+        timers, self.timers = self.timers, list()
+        for timer in timers:
+            if timer.cycle > self.pc_register:
+                self.timers.append(timer)
+                continue
+            cycle = timer.action()
+            if cycle is not None:
+                self.schedule(max(cycle, self.pc_register + 1), timer.action)
+
+    def play(self, keyboard: Keyboard) -> None:
+        first = keyboard.next_cycle
+        if first is not None:
+            self.schedule(first, lambda: keyboard.press(self.ram, self.pc_register))
+
+    def frame(self, image_format: str) -> bytes:
+        return ENCODERS[image_format](self.ram.screen)
+
+    def console(self) -> list[str]:
+        return list() if self.jack_os is None else self.jack_os.lines()
+
+    def dump_ram(self) -> list[str]:
+        return list(self.ram.json_lines())
+
+    def ram_changes(self) -> list[tuple[int, int]]:
+        return self.ram_diff.changes(self.ram)
+
+    def ram_json(self, ranges: Sequence[range]) -> Iterable[str]:
+        return self.ram.json_lines(ranges)
+
+    def ram_image(self) -> bytes:
+        return self.ram.image()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import TYPE_CHECKING, Iterator, Sequence, TypeAlias
+
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
+# 15-bit address space: RAM, SCREEN (16384-24575) and KBD (24576)
+RAM_SIZE = 32768
+SCREEN = 16384
+KEYBOARD = 24576
+# words compared at once when looking for changed cells
+CHUNK = 128
+
+
+# native int16 words, either private or mapped from a buffer other processes can read
+Words: TypeAlias = "array[int] | memoryview"
+
+
+def _words() -> Words:
+    return array("h", bytes(2 * RAM_SIZE))
+
+
+def shared_words(buffer: WriteableBuffer) -> memoryview:
+    words = memoryview(buffer).cast("h")
+    if len(words) != RAM_SIZE:
+        words.release()
+        raise ValueError(f"Shared RAM must hold {RAM_SIZE} words")
+    return words
+
+
+@dataclass
+class Memory:
+    words: Words = field(default_factory=_words)
+    touched: bytearray = field(default_factory=lambda: bytearray(RAM_SIZE))
+
+    def __getitem__(self, address: int) -> int:
+        self.touched[address] = 1
+        return self.words[address]
+
+    def __setitem__(self, address: int, value: int) -> None:
+        self.touched[address] = 1
+        self.words[address] = value
+
+    @property
+    def screen(self) -> memoryview:
+        return memoryview(self.words)[SCREEN:KEYBOARD]
+
+    def __len__(self) -> int:
+        return self.touched.count(1)
+
+    def items(self, start: int = 0, end: int = RAM_SIZE) -> Iterator[tuple[int, int]]:
+        address = self.touched.find(1, start, end)
+        while address != -1:
+            yield address, self.words[address]
+            address = self.touched.find(1, address + 1, end)
+
+    def image(self) -> bytes:
+        words = self.words
+        if sys.byteorder == "big":
+            words = array("h", words)
+            words.byteswap()
+        return words.tobytes()
+
+    def json_lines(self, ranges: Sequence[range] = (range(RAM_SIZE),)) -> Iterator[str]:
+        yield "{"
+        yield '  "RAM": {'
+        previous = None
+        cells = (self.items(cells.start, cells.stop) for cells in ranges)
+        for address, value in chain.from_iterable(cells):
+            if previous is not None:
+                yield f"    {previous},"
+            previous = f'"{address}": {value}'
+        if previous is not None:
+            yield f"    {previous}"
+        yield "  }"
+        yield "}"
+
+
+@dataclass
+class RamDiff:
+    words: bytes = bytes(2 * RAM_SIZE)
+    touched: bytes = bytes(RAM_SIZE)
+
+    def changes(self, memory: Memory) -> list[tuple[int, int]]:
+        words, touched = memory.words.tobytes(), bytes(memory.touched)
+        changed = list()
+        for start in range(0, RAM_SIZE, CHUNK):
+            end = start + CHUNK
+            if (
+                touched[start:end] == self.touched[start:end]
+                and words[2 * start : 2 * end] == self.words[2 * start : 2 * end]
+            ):
+                continue
+            for address in range(start, end):
+                if touched[address] and (
+                    not self.touched[address]
+                    or words[2 * address : 2 * address + 2]
+                    != self.words[2 * address : 2 * address + 2]
+                ):
+                    changed.append((address, memory.words[address]))
+        self.words, self.touched = words, touched
+        return changed
+
+
+def parse_ranges(text: str) -> list[range]:
+    ranges = list()
+    for part in text.split(","):
+        first, _, last = part.strip().partition("-")
+        start, stop = int(first), int(last or first) + 1
+        if not 0 <= start < stop <= RAM_SIZE:
+            raise ValueError(f"Bad address range: {part}")
+        ranges.append(range(start, stop))
+
+    merged: list[range] = list()
+    for cells in sorted(ranges, key=lambda cells: cells.start):
+        if merged and cells.start <= merged[-1].stop:
+            previous = merged.pop()
+            cells = range(previous.start, max(previous.stop, cells.stop))
+        merged.append(cells)
+    return merged
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Callable, Mapping
+
+from n2t.core.cpu_emulator.decoder import A_INSTRUCTION, Instruction
+
+NO_LABEL = "-"
+LABEL_ROW = "{:<32} {:>12} {:>7}"
+ADDRESS_ROW = "{:>7} {:<32} {:>12} {:>7} {:>12}"
+
+_Locate = Callable[[int], tuple[str, int]]
+
+
+@dataclass
+class Profile:
+    executions: list[int]
+    jumps_taken: list[int]
+
+    @classmethod
+    def create(cls, size: int) -> Profile:
+        return cls([0] * size, [0] * size)
+
+    def report(
+        self,
+        program: list[Instruction],
+        labels: Mapping[str, int],
+        top: int = 20,
+    ) -> list[str]:
+        total = sum(self.executions) or 1
+        locate = _locator(labels)
+
+        per_label: dict[str, int] = dict()
+        for index, count in enumerate(self.executions):
+            if count:
+                label = locate(index)[0]
+                per_label[label] = per_label.get(label, 0) + count
+
+        lines = [LABEL_ROW.format("label", "cycles", "share")]
+        for label, count in sorted(per_label.items(), key=lambda item: -item[1])[:top]:
+            lines.append(LABEL_ROW.format(label, count, f"{count / total:.2%}"))
+
+        lines.append("")
+        lines.append(
+            ADDRESS_ROW.format("address", "location", "cycles", "share", "taken")
+        )
+        hottest = sorted(
+            range(len(self.executions)), key=lambda index: -self.executions[index]
+        )
+        for index in hottest[:top]:
+            count = self.executions[index]
+            if not count:
+                break
+            label, offset = locate(index)
+            location = (
+                label if offset == 0 or label == NO_LABEL else f"{label}+{offset}"
+            )
+            taken = (
+                str(self.jumps_taken[index])
+                if program[index].opcode != A_INSTRUCTION and program[index].jump
+                else ""
+            )
+            row = ADDRESS_ROW.format(
+                index, location, count, f"{count / total:.2%}", taken
+            )
+            lines.append(row.rstrip())
+        return lines
+
+
+def _locator(labels: Mapping[str, int]) -> _Locate:
+    ordered = sorted((address, label) for label, address in labels.items())
+    addresses = [address for address, _ in ordered]
+
+    def locate(index: int) -> tuple[str, int]:
+        position = bisect_right(addresses, index) - 1
+        if position < 0:
+            return NO_LABEL, index
+        address, label = ordered[position]
+        return label, index - address
+
+    return locate
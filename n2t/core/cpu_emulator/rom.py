@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from _typeshed import ReadableBuffer
+
+MAGIC = b"N2TR"
+VERSION = 1
+
+# magic, version, word count; the words follow as big-endian unsigned 16-bit
+HEADER = struct.Struct(">4sHI")
+
+
+def pack(words: Iterable[int]) -> bytes:
+    image = array("H", words)
+    if sys.byteorder == "little":
+        image.byteswap()
+    return HEADER.pack(MAGIC, VERSION, len(image)) + image.tobytes()
+
+
+def unpack(data: ReadableBuffer) -> array[int]:
+    with memoryview(data) as view:
+        if len(view) < HEADER.size:
+            raise ValueError("Packed program is truncated")
+        magic, version, count = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a packed Hack program")
+        if len(view) != HEADER.size + 2 * count:
+            raise ValueError("Packed program is truncated")
+        words = array("H")
+        words.frombytes(view[HEADER.size :])
+    if sys.byteorder == "little":
+        words.byteswap()
+    return words
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Callable
+
+WIDTH = 512
+HEIGHT = 256
+BLACK = 0
+WHITE = 255
+
+# Hack pixels run from the least significant bit of each little-endian word, so
+# every byte of the screen holds 8 pixels from its lowest bit up
+_REVERSED = bytes(int(f"{byte:08b}"[::-1], base=2) for byte in range(256))
+_GRAY = [
+    bytes(BLACK if byte >> bit & 1 else WHITE for bit in range(8))
+    for byte in range(256)
+]
+
+Encoder = Callable[[memoryview], bytes]
+
+
+def screen_bytes(screen: memoryview) -> bytes:
+    if sys.byteorder == "little":
+        return screen.tobytes()
+    words = array("h", screen)
+    words.byteswap()
+    return words.tobytes()
+
+
+def pbm(screen: memoryview) -> bytes:
+    return b"P4\n%d %d\n" % (WIDTH, HEIGHT) + screen_bytes(screen).translate(_REVERSED)
+
+
+def pgm(screen: memoryview) -> bytes:
+    header = b"P5\n%d %d\n%d\n" % (WIDTH, HEIGHT, WHITE)
+    return header + b"".join(map(_GRAY.__getitem__, screen_bytes(screen)))
+
+
+ENCODERS: dict[str, Encoder] = {"pbm": pbm, "pgm": pgm}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+
+from n2t.core.cpu_emulator.decoder import Instruction, encode_word
+from n2t.core.cpu_emulator.memory import RAM_SIZE
+
+MAGIC = b"N2TS"
+VERSION = 1
+
+# magic, version, A, D, program index, executed cycles, halted, program checksum
+HEADER = struct.Struct("<4sHhhIQ?I")
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    a_register: int
+    d_register: int
+    index: int
+    cycles: int
+    halted: bool
+    checksum: int
+    words: array[int]
+    touched: bytes
+
+    def to_bytes(self) -> bytes:
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.a_register,
+            self.d_register,
+            self.index,
+            self.cycles,
+            self.halted,
+            self.checksum,
+        )
+        return header + zlib.compress(_little_endian(self.words) + self.touched)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Snapshot:
+        magic, version, a, d, index, cycles, halted, checksum = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not an emulator snapshot")
+
+        body = zlib.decompress(data[HEADER.size :])
+        words = array("h", body[: 2 * RAM_SIZE])
+        if sys.byteorder == "big":
+            words.byteswap()
+        return cls(a, d, index, cycles, halted, checksum, words, body[2 * RAM_SIZE :])
+
+
+def program_checksum(program: list[Instruction]) -> int:
+    return zlib.crc32(_little_endian(array("H", map(encode_word, program))))
+
+
+def _little_endian(words: array[int]) -> bytes:
+    if sys.byteorder == "big":
+        words = array(words.typecode, words)
+        words.byteswap()
+    return words.tobytes()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator, NamedTuple
+
+MAGIC = b"N2TT"
+VERSION = 1
+# magic, version, records kept, instructions recorded in total
+HEADER = struct.Struct("<4sHIQ")
+
+FIELDS = 5
+NO_WRITE = -1
+ADDRESS_MASK = 0x7FFF
+
+
+class TraceRecord(NamedTuple):
+    pc: int
+    a_register: int
+    d_register: int
+    address: int | None
+    value: int | None
+
+    def describe(self) -> str:
+        registers = f"{self.pc:>5}  A={self.a_register:<6} D={self.d_register:<6}"
+        if self.address is None:
+            return registers.rstrip()
+        return f"{registers} RAM[{self.address}]={self.value}"
+
+
+@dataclass
+class Trace:
+    capacity: int
+    records: array[int] = field(repr=False)
+    recorded: int = 0
+
+    @classmethod
+    def create(cls, capacity: int) -> Trace:
+        if capacity <= 0:
+            raise ValueError("Trace capacity must be positive")
+        return cls(capacity, array("h", bytes(2 * FIELDS * capacity)))
+
+    def __len__(self) -> int:
+        return min(self.recorded, self.capacity)
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        start = self.recorded - len(self)
+        for position in range(start, self.recorded):
+            slot = (position % self.capacity) * FIELDS
+            pc, a, d, address, value = self.records[slot : slot + FIELDS]
+            if address == NO_WRITE:
+                yield TraceRecord(pc, a, d, None, None)
+            else:
+                yield TraceRecord(pc, a, d, address, value)
+
+    def to_bytes(self) -> bytes:
+        records = self.records[: FIELDS * len(self)]
+        header = HEADER.pack(MAGIC, VERSION, len(self), self.recorded)
+        return header + _little_endian(records).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Trace:
+        if len(data) < HEADER.size:
+            raise ValueError("Trace is truncated")
+        magic, version, kept, recorded = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not an emulator trace")
+        records = _little_endian(array("h", data[HEADER.size :]))
+        if len(records) != FIELDS * kept or kept > recorded:
+            raise ValueError("Trace is truncated")
+        if not kept:
+            return cls.create(1)
+        # a ring of exactly the kept records keeps every record in its slot
+        return cls(kept, records, recorded)
+
+
+def _little_endian(words: array[int]) -> array[int]:
+    if sys.byteorder == "big":
+        words = array("h", words)
+        words.byteswap()
+    return words
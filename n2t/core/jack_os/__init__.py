@@ -0,0 +1,3 @@
+from n2t.core.jack_os.facade import NATIVES, SYS_INIT, JackOS
+
+__all__ = ["JackOS", "NATIVES", "SYS_INIT"]
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from functools import partial
+from math import isqrt
+from typing import Callable
+
+from n2t.core.cpu_emulator.alu import WORD_MASK, to_word
+from n2t.core.cpu_emulator.memory import KEYBOARD, SCREEN, Memory
+from n2t.core.jack_os.heap import Heap
+
+Native = Callable[..., int]
+
+SCREEN_WIDTH = 512
+SCREEN_HEIGHT = 256
+WORDS_PER_ROW = SCREEN_WIDTH // 16
+ROWS = 23
+COLUMNS = 64
+NEW_LINE = 128
+BACKSPACE = 129
+DOUBLE_QUOTE = 34
+
+# String objects are [max length, length, characters...] heap blocks
+MAX_LENGTH = 0
+LENGTH = 1
+CHARACTERS = 2
+
+# Runs Main.main like the OS Sys.init when the program does not bring one
+SYS_INIT = [
+    "function Sys.init 0",
+    "call Main.main 0",
+    "pop temp 0",
+    "label HALT",
+    "goto HALT",
+]
+
+
+@dataclass
+class JackOS:
+    ram: Memory
+    heap: Heap = field(default_factory=Heap)
+    color: bool = True
+    row: int = 0
+    column: int = 0
+    console: list[list[str]] = field(
+        default_factory=lambda: [[" "] * COLUMNS for _ in range(ROWS)]
+    )
+    halted: bool = False
+    error: int | None = None
+
+    @classmethod
+    def create(cls, ram: Memory) -> JackOS:
+        return cls(ram)
+
+    def routine(self, name: str) -> Native:
+        return partial(NATIVES[name], self)
+
+    def call_from_frame(self, name: str) -> int:
+        # Runs a routine that a translated `call` just jumped to and returns from
+        # it the way the translated `return` does; gives the next ROM address
+        ram = self.ram
+        argument = ram[2]
+        arguments = [ram[argument + i] for i in range(ram[0] - 5 - argument)]
+        result = NATIVES[name](self, *arguments)
+
+        frame = ram[1]
+        ram[argument] = result
+        ram[0] = argument + 1
+        ram[4], ram[3], ram[2], ram[1] = (ram[frame - i] for i in range(1, 5))
+        return ram[frame - 5]
+
+    def lines(self) -> list[str]:
+        return ["".join(line).rstrip() for line in self.console]
+
+    def sys_error(self, code: int) -> int:
+        self.halted = True
+        self.error = code
+        return 0
+
+    def sys_halt(self) -> int:
+        self.halted = True
+        return 0
+
+    def sys_wait(self, duration: int) -> int:
+        return self.sys_error(1) if duration < 0 else 0
+
+    def init(self) -> int:
+        return 0
+
+    def math_abs(self, x: int) -> int:
+        return to_word(abs(x))
+
+    def math_multiply(self, x: int, y: int) -> int:
+        return to_word(x * y)
+
+    def math_divide(self, x: int, y: int) -> int:
+        if y == 0:
+            return self.sys_error(3)
+        quotient = abs(x) // abs(y)
+        return to_word(quotient if (x < 0) == (y < 0) else -quotient)
+
+    def math_min(self, x: int, y: int) -> int:
+        return min(x, y)
+
+    def math_max(self, x: int, y: int) -> int:
+        return max(x, y)
+
+    def math_sqrt(self, x: int) -> int:
+        return self.sys_error(4) if x < 0 else isqrt(x)
+
+    def memory_peek(self, address: int) -> int:
+        return self.ram[address]
+
+    def memory_poke(self, address: int, value: int) -> int:
+        self.ram[address] = value
+        return 0
+
+    def memory_alloc(self, size: int) -> int:
+        if size <= 0:
+            return self.sys_error(5)
+        address = self.heap.alloc(size)
+        return self.sys_error(6) if address is None else address
+
+    def memory_de_alloc(self, address: int) -> int:
+        self.heap.free_block(address)
+        return 0
+
+    def array_new(self, size: int) -> int:
+        return self.sys_error(2) if size <= 0 else self.memory_alloc(size)
+
+    def string_new(self, max_length: int) -> int:
+        if max_length < 0:
+            return self.sys_error(14)
+        string = self.memory_alloc(max_length + CHARACTERS)
+        self.ram[string + MAX_LENGTH] = max_length
+        self.ram[string + LENGTH] = 0
+        return string
+
+    def string_length(self, string: int) -> int:
+        return self.ram[string + LENGTH]
+
+    def string_char_at(self, string: int, index: int) -> int:
+        if not 0 <= index < self.ram[string + LENGTH]:
+            return self.sys_error(15)
+        return self.ram[string + CHARACTERS + index]
+
+    def string_set_char_at(self, string: int, index: int, character: int) -> int:
+        if not 0 <= index < self.ram[string + LENGTH]:
+            return self.sys_error(16)
+        self.ram[string + CHARACTERS + index] = character
+        return 0
+
+    def string_append_char(self, string: int, character: int) -> int:
+        length = self.ram[string + LENGTH]
+        if length >= self.ram[string + MAX_LENGTH]:
+            return self.sys_error(17)
+        self.ram[string + CHARACTERS + length] = character
+        self.ram[string + LENGTH] = length + 1
+        return string
+
+    def string_erase_last_char(self, string: int) -> int:
+        length = self.ram[string + LENGTH]
+        if length == 0:
+            return self.sys_error(18)
+        self.ram[string + LENGTH] = length - 1
+        return 0
+
+    def string_int_value(self, string: int) -> int:
+        text = self.text(string)
+        sign = -1 if text[:1] == "-" else 1
+        digits = text[1:] if sign < 0 else text
+        value = 0
+        for digit in digits:
+            if not digit.isdigit():
+                break
+            value = value * 10 + int(digit)
+        return to_word(sign * value)
+
+    def string_set_int(self, string: int, value: int) -> int:
+        digits = str(value)
+        if len(digits) > self.ram[string + MAX_LENGTH]:
+            return self.sys_error(19)
+        for index, digit in enumerate(digits):
+            self.ram[string + CHARACTERS + index] = ord(digit)
+        self.ram[string + LENGTH] = len(digits)
+        return 0
+
+    def string_new_line(self) -> int:
+        return NEW_LINE
+
+    def string_back_space(self) -> int:
+        return BACKSPACE
+
+    def string_double_quote(self) -> int:
+        return DOUBLE_QUOTE
+
+    def text(self, string: int) -> str:
+        start = string + CHARACTERS
+        return "".join(
+            chr(self.ram[address])
+            for address in range(start, start + self.ram[string + LENGTH])
+        )
+
+    def output_move_cursor(self, row: int, column: int) -> int:
+        if not (0 <= row < ROWS and 0 <= column < COLUMNS):
+            return self.sys_error(20)
+        self.row, self.column = row, column
+        return 0
+
+    def output_print_char(self, character: int) -> int:
+        if character == NEW_LINE:
+            return self.output_println()
+        if character == BACKSPACE:
+            return self.output_back_space()
+        self.console[self.row][self.column] = chr(character)
+        self.column += 1
+        if self.column == COLUMNS:
+            self.output_println()
+        return 0
+
+    def output_print_string(self, string: int) -> int:
+        for character in self.text(string):
+            self.output_print_char(ord(character))
+        return 0
+
+    def output_print_int(self, value: int) -> int:
+        for digit in str(value):
+            self.output_print_char(ord(digit))
+        return 0
+
+    def output_println(self) -> int:
+        self.row, self.column = (self.row + 1) % ROWS, 0
+        return 0
+
+    def output_back_space(self) -> int:
+        if self.column > 0:
+            self.column -= 1
+        elif self.row > 0:
+            self.row, self.column = self.row - 1, COLUMNS - 1
+        self.console[self.row][self.column] = " "
+        return 0
+
+    def screen_clear_screen(self) -> int:
+        self.ram.words[SCREEN:KEYBOARD] = array("h", bytes(2 * (KEYBOARD - SCREEN)))
+        self.ram.touched[SCREEN:KEYBOARD] = b"\x01" * (KEYBOARD - SCREEN)
+        return 0
+
+    def screen_set_color(self, color: int) -> int:
+        self.color = color != 0
+        return 0
+
+    def screen_draw_pixel(self, x: int, y: int) -> int:
+        if not _on_screen(x, y):
+            return self.sys_error(7)
+        self.fill_row(y, x, x)
+        return 0
+
+    def screen_draw_line(self, x1: int, y1: int, x2: int, y2: int) -> int:
+        if not (_on_screen(x1, y1) and _on_screen(x2, y2)):
+            return self.sys_error(8)
+        if y1 == y2:
+            self.fill_row(y1, min(x1, x2), max(x1, x2))
+            return 0
+
+        dx, dy = abs(x2 - x1), abs(y2 - y1)
+        step_x, step_y = (1 if x2 >= x1 else -1), (1 if y2 >= y1 else -1)
+        a = b = difference = 0
+        while a <= dx and b <= dy:
+            self.fill_row(y1 + b * step_y, x1 + a * step_x, x1 + a * step_x)
+            if difference < 0:
+                a, difference = a + 1, difference + dy
+            else:
+                b, difference = b + 1, difference - dx
+        return 0
+
+    def screen_draw_rectangle(self, x1: int, y1: int, x2: int, y2: int) -> int:
+        if not (_on_screen(x1, y1) and _on_screen(x2, y2) and x1 <= x2 and y1 <= y2):
+            return self.sys_error(9)
+        for y in range(y1, y2 + 1):
+            self.fill_row(y, x1, x2)
+        return 0
+
+    def screen_draw_circle(self, x: int, y: int, radius: int) -> int:
+        if not _on_screen(x, y):
+            return self.sys_error(12)
+        if not 0 <= radius <= 181:
+            return self.sys_error(13)
+        for dy in range(-radius, radius + 1):
+            if 0 <= y + dy < SCREEN_HEIGHT:
+                half = isqrt(radius * radius - dy * dy)
+                self.fill_row(y + dy, max(x - half, 0), min(x + half, SCREEN_WIDTH - 1))
+        return 0
+
+    def fill_row(self, y: int, x1: int, x2: int) -> None:
+        row = SCREEN + y * WORDS_PER_ROW
+        for word in range(x1 // 16, x2 // 16 + 1):
+            low = max(x1 - word * 16, 0)
+            high = min(x2 - word * 16, 15)
+            mask = ((1 << (high + 1)) - 1) ^ ((1 << low) - 1)
+            value = self.ram[row + word] & WORD_MASK
+            value = value | mask if self.color else value & ~mask
+            self.ram[row + word] = to_word(value)
+
+    def keyboard_key_pressed(self) -> int:
+        return self.ram[KEYBOARD]
+
+
+def _on_screen(x: int, y: int) -> bool:
+    return 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT
+
+
+NATIVES: dict[str, Native] = {
+    "Sys.halt": JackOS.sys_halt,
+    "Sys.error": JackOS.sys_error,
+    "Sys.wait": JackOS.sys_wait,
+    "Math.init": JackOS.init,
+    "Math.abs": JackOS.math_abs,
+    "Math.multiply": JackOS.math_multiply,
+    "Math.divide": JackOS.math_divide,
+    "Math.min": JackOS.math_min,
+    "Math.max": JackOS.math_max,
+    "Math.sqrt": JackOS.math_sqrt,
+    "Memory.init": JackOS.init,
+    "Memory.peek": JackOS.memory_peek,
+    "Memory.poke": JackOS.memory_poke,
+    "Memory.alloc": JackOS.memory_alloc,
+    "Memory.deAlloc": JackOS.memory_de_alloc,
+    "Array.new": JackOS.array_new,
+    "Array.dispose": JackOS.memory_de_alloc,
+    "String.new": JackOS.string_new,
+    "String.dispose": JackOS.memory_de_alloc,
+    "String.length": JackOS.string_length,
+    "String.charAt": JackOS.string_char_at,
+    "String.setCharAt": JackOS.string_set_char_at,
+    "String.appendChar": JackOS.string_append_char,
+    "String.eraseLastChar": JackOS.string_erase_last_char,
+    "String.intValue": JackOS.string_int_value,
+    "String.setInt": JackOS.string_set_int,
+    "String.newLine": JackOS.string_new_line,
+    "String.backSpace": JackOS.string_back_space,
+    "String.doubleQuote": JackOS.string_double_quote,
+    "Output.init": JackOS.init,
+    "Output.moveCursor": JackOS.output_move_cursor,
+    "Output.printChar": JackOS.output_print_char,
+    "Output.printString": JackOS.output_print_string,
+    "Output.printInt": JackOS.output_print_int,
+    "Output.println": JackOS.output_println,
+    "Output.backSpace": JackOS.output_back_space,
+    "Screen.init": JackOS.init,
+    "Screen.clearScreen": JackOS.screen_clear_screen,
+    "Screen.setColor": JackOS.screen_set_color,
+    "Screen.drawPixel": JackOS.screen_draw_pixel,
+    "Screen.drawLine": JackOS.screen_draw_line,
+    "Screen.drawRectangle": JackOS.screen_draw_rectangle,
+    "Screen.drawCircle": JackOS.screen_draw_circle,
+    "Keyboard.init": JackOS.init,
+    "Keyboard.keyPressed": JackOS.keyboard_key_pressed,
+}
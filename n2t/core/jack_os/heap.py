@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+HEAP_BASE = 2048
+HEAP_END = 16384
+
+
+@dataclass
+class Heap:
+    free: list[tuple[int, int]] = field(
+        default_factory=lambda: [(HEAP_BASE, HEAP_END - HEAP_BASE)]
+    )
+    allocated: dict[int, int] = field(default_factory=dict)
+
+    def alloc(self, size: int) -> int | None:
+        for position, (address, length) in enumerate(self.free):
+            if length >= size:
+                if length == size:
+                    del self.free[position]
+                else:
+                    self.free[position] = (address + size, length - size)
+                self.allocated[address] = size
+                return address
+        return None
+
+    def free_block(self, address: int) -> None:
+        size = self.allocated.pop(address, None)
+        if size is None:
+            return
+        blocks = sorted(self.free + [(address, size)])
+        self.free = blocks[:1]
+        for start, length in blocks[1:]:
+            previous, previous_length = self.free[-1]
+            if previous + previous_length == start:
+                self.free[-1] = (previous, previous_length + length)
+            else:
+                self.free.append((start, length))
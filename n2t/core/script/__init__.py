@@ -0,0 +1,5 @@
+from n2t.core.script.facade import ScriptRunner
+
+__all__ = [
+    "ScriptRunner",
+]
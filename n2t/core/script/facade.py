@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from n2t.core.cpu_emulator.decoder import Instruction, decode_words
+from n2t.core.cpu_emulator.facade import Emulator
+from n2t.core.script.parser import Column, Command, parse, parse_column
+
+CLOCK_COMMANDS = {"tick": 0, "tock": 1, "ticktock": 1}
+IGNORED_COMMANDS = {"echo", "clear-echo", "breakpoint", "clear-breakpoints"}
+
+WordsLoader = Callable[[str], Iterable[str]]
+
+
+@dataclass
+class ScriptRunner:
+    loader: WordsLoader
+    emulator: Emulator = field(default_factory=Emulator.create)
+    program: list[Instruction] = field(default_factory=list)
+    columns: list[Column] = field(default_factory=list)
+    output: list[str] = field(default_factory=list)
+    output_file: str | None = None
+    compare_to: str | None = None
+    time: int = 0
+
+    @classmethod
+    def create(cls, loader: WordsLoader) -> ScriptRunner:
+        return cls(loader)
+
+    def run(self, script: str) -> list[str]:
+        for command in parse(script):
+            self.execute(command)
+        return self.output
+
+    def execute(self, command: Command) -> None:
+        name, arguments, body = command
+        if name in CLOCK_COMMANDS:
+            self.tick(CLOCK_COMMANDS[name])
+        elif name == "repeat":
+            self.repeat(int(arguments[0]), body)
+        elif name == "load":
+            self.emulator = Emulator.create()
+            self.time = 0
+            self.program = decode_words(self.loader(arguments[0]))
+        elif name == "output-file":
+            self.output_file = arguments[0]
+        elif name == "compare-to":
+            self.compare_to = arguments[0]
+        elif name == "set":
+            self.set(arguments[0], int(arguments[1]))
+        elif name == "output-list":
+            self.columns = [parse_column(argument) for argument in arguments]
+            self.output.append(_row(_header(column) for column in self.columns))
+        elif name == "output":
+            self.output.append(
+                _row(_cell(column, self.get(column.name)) for column in self.columns)
+            )
+        elif name not in IGNORED_COMMANDS:
+            raise ValueError(f"Unsupported script command: {name}")
+
+    def repeat(self, times: int, body: tuple[Command, ...]) -> None:
+        if all(command.name in CLOCK_COMMANDS for command in body):
+            cycles = sum(CLOCK_COMMANDS[command.name] for command in body)
+            self.tick(times * cycles)
+            return
+        for _ in range(times):
+            for command in body:
+                self.execute(command)
+
+    def tick(self, cycles: int) -> None:
+        # time counts the clock the script drives, even after a halt is detected
+        self.emulator.run(self.program, cycles)
+        self.time += cycles
+
+    def set(self, name: str, value: int) -> None:
+        # the program may leave its halt loop once its state changes
+        self.emulator.halted = self.emulator.stopped = False
+        if name.startswith("RAM["):
+            self.emulator.ram[int(name[4:-1])] = value
+        elif name == "A":
+            self.emulator.a_register = value
+        elif name == "D":
+            self.emulator.d_register = value
+        elif name == "PC":
+            self.emulator.index = value
+        else:
+            raise ValueError(f"Unsupported script variable: {name}")
+
+    def get(self, name: str) -> int:
+        if name.startswith("RAM["):
+            return self.emulator.ram.words[int(name[4:-1])]
+        elif name == "A":
+            return self.emulator.a_register
+        elif name == "D":
+            return self.emulator.d_register
+        elif name == "PC":
+            return self.emulator.index
+        elif name == "time":
+            return self.time
+        raise ValueError(f"Unsupported script variable: {name}")
+
+
+def compare(output: list[str], expected: list[str]) -> int | None:
+    for line, (actual, wanted) in enumerate(zip(output, expected), start=1):
+        if not _matches(actual.rstrip(), wanted.rstrip()):
+            return line
+    if len(output) != len(expected):
+        return min(len(output), len(expected)) + 1
+    return None
+
+
+def _matches(actual: str, wanted: str) -> bool:
+    return len(actual) == len(wanted) and all(
+        w == "*" or a == w for a, w in zip(actual, wanted)
+    )
+
+
+def _row(cells: Iterable[str]) -> str:
+    return "|" + "|".join(cells) + "|"
+
+
+def _header(column: Column) -> str:
+    total = column.left + column.width + column.right
+    name = column.name[:total]
+    padding = total - len(name)
+    return " " * (padding // 2) + name + " " * (padding - padding // 2)
+
+
+def _cell(column: Column, value: int) -> str:
+    if column.format == "B":
+        text = f"{value & 0xFFFF:016b}"
+    elif column.format == "X":
+        text = f"{value & 0xFFFF:04X}"
+    else:
+        text = str(value)
+    text = text.rjust(column.width)[-column.width :]
+    return " " * column.left + text + " " * column.right
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import re
+from typing import Iterator, NamedTuple
+
+_COMMENTS = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_TOKENS = re.compile(r"[{},;!]|[^\s{},;!]+")
+_SEPARATORS = {",", ";", "!"}
+
+
+class Command(NamedTuple):
+    name: str
+    arguments: tuple[str, ...] = ()
+    body: tuple[Command, ...] = ()
+
+
+class Column(NamedTuple):
+    name: str
+    format: str = "D"
+    left: int = 1
+    width: int = 6
+    right: int = 1
+
+
+def parse(script: str) -> list[Command]:
+    tokens = iter(_TOKENS.findall(_COMMENTS.sub("", script)))
+    return list(_parse_commands(tokens))
+
+
+def _parse_commands(tokens: Iterator[str]) -> Iterator[Command]:
+    words: list[str] = list()
+    for token in tokens:
+        if token in _SEPARATORS:
+            if words:
+                yield Command(words[0], tuple(words[1:]))
+            words = list()
+        elif token == "{":
+            if words[:1] != ["repeat"]:
+                raise ValueError(f"Unsupported script block: {' '.join(words)}")
+            yield Command("repeat", tuple(words[1:]), tuple(_parse_commands(tokens)))
+            words = list()
+        elif token == "}":
+            break
+        else:
+            words.append(token)
+
+    if words:
+        yield Command(words[0], tuple(words[1:]))
+
+
+def parse_column(specification: str) -> Column:
+    name, _, layout = specification.partition("%")
+    if not layout:
+        return Column(name)
+    left, width, right = layout[1:].split(".")
+    return Column(name, layout[0], int(left), int(width), int(right))
@@ -0,0 +1,3 @@
+from n2t.core.vm_emulator.facade import VMEmulator
+
+__all__ = ["VMEmulator"]
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from n2t.core.cpu_emulator.alu import SIGN_BIT, WORD_MASK
+from n2t.core.cpu_emulator.machine import Machine, Timer
+from n2t.core.cpu_emulator.memory import Memory, RamDiff
+from n2t.core.jack_os import NATIVES, JackOS
+from n2t.core.vm_emulator.loader import (
+    ADD,
+    AND,
+    CALL,
+    CALL_NATIVE,
+    EQ,
+    FUNCTION,
+    GOTO,
+    GT,
+    IF_GOTO,
+    NEG,
+    NOT,
+    OR,
+    POP_FIXED,
+    POP_SEGMENT,
+    PUSH_CONSTANT,
+    PUSH_FIXED,
+    PUSH_SEGMENT,
+    RETURN,
+    SUB,
+    VMProgram,
+    load,
+)
+
+FRAME_REGISTER = 13
+RETURN_REGISTER = 14
+
+
+@dataclass
+class VMEmulator(Machine):
+    ram: Memory = field(default_factory=Memory)
+    pc_register: int = 0
+    index: int = 0
+    halted: bool = False
+    stopped: bool = False
+    program: VMProgram | None = field(default=None, repr=False)
+    jack_os: JackOS | None = field(default=None, repr=False)
+    timers: list[Timer] = field(default_factory=list, repr=False)
+    ram_diff: RamDiff = field(default_factory=RamDiff, repr=False)
+
+    @classmethod
+    def create(cls, native_os: bool = False, ram: Memory | None = None) -> VMEmulator:
+        ram = Memory() if ram is None else ram
+        return cls(ram, jack_os=JackOS.create(ram) if native_os else None)
+
+    def emulate(
+        self,
+        vm_language: Iterable[str],
+        cycles: int,
+        boot: bool = False,
+        name: str = "",
+    ) -> Iterable[str]:
+        natives = NATIVES if self.jack_os is not None else ()
+        self.run(load(vm_language, boot, name, natives), cycles)
+        return self.ram.json_lines()
+
+    def run(self, program: VMProgram, cycles: int) -> None:
+        self.program = program
+        self.advance(cycles)
+
+    def ended(self) -> bool:
+        return self.program is not None and self.index >= len(self.program.operations)
+
+    def dispatch(self, cycles: int) -> None:
+        if not self.halted:
+            self.interpret(cycles)
+
+    def interpret(self, cycles: int) -> None:
+        assert self.program is not None
+        operations, returns, linked = self.program
+        jack_os = self.jack_os
+        natives = [jack_os.routine(name) for name in linked] if jack_os else []
+        ram, touched = self.ram.words, self.ram.touched
+        index = self.index
+        size = len(operations)
+        executed = 0
+        while executed < cycles and index < size:
+            kind, x, y, z = operations[index]
+            executed += 1
+            index += 1
+            if kind == PUSH_CONSTANT:
+                sp = ram[0]
+                ram[sp] = x
+                ram[0] = sp + 1
+                touched[sp] = touched[0] = 1
+            elif kind == PUSH_SEGMENT:
+                address = ram[x] + y
+                sp = ram[0]
+                ram[sp] = ram[address]
+                ram[0] = sp + 1
+                touched[x] = touched[address] = touched[sp] = touched[0] = 1
+            elif kind == PUSH_FIXED:
+                sp = ram[0]
+                ram[sp] = ram[x]
+                ram[0] = sp + 1
+                touched[x] = touched[sp] = touched[0] = 1
+            elif kind == POP_SEGMENT or kind == POP_FIXED:
+                address = ram[x] + y if kind == POP_SEGMENT else x
+                sp = ram[0] - 1
+                ram[0] = sp
+                ram[RETURN_REGISTER] = address
+                ram[address] = ram[sp]
+                touched[x] = touched[address] = touched[sp] = touched[0] = 1
+                touched[RETURN_REGISTER] = 1
+            elif kind == GOTO:
+                if x == index - 1:
+                    self.halted = True
+                    index = x
+                    break
+                index = x
+            elif kind == IF_GOTO:
+                sp = ram[0] - 1
+                touched[sp] = touched[0] = 1
+                ram[0] = sp
+                if ram[sp]:
+                    index = x
+            elif kind <= OR:
+                sp = ram[0] - 1
+                a, b = ram[sp - 1], ram[sp]
+                if kind == ADD:
+                    value = ((a + b + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+                elif kind == SUB:
+                    value = ((a - b + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+                elif kind == AND:
+                    value = a & b
+                elif kind == OR:
+                    value = a | b
+                else:
+                    difference = ((a - b + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+                    if kind == EQ:
+                        value = -(difference == 0)
+                    elif kind == GT:
+                        value = -(difference > 0)
+                    else:
+                        value = -(difference < 0)
+                ram[sp - 1] = value
+                touched[sp - 1] = touched[sp] = touched[0] = 1
+                ram[0] = sp
+            elif kind == NEG:
+                sp = ram[0] - 1
+                ram[sp] = ((SIGN_BIT - ram[sp]) & WORD_MASK) - SIGN_BIT
+                touched[sp] = touched[0] = 1
+            elif kind == NOT:
+                sp = ram[0] - 1
+                ram[sp] = ~ram[sp]
+                touched[sp] = touched[0] = 1
+            elif kind == FUNCTION:
+                sp = ram[0]
+                for local in range(sp, sp + x):
+                    ram[local] = 0
+                    touched[local] = 1
+                touched[0] = 1
+                ram[0] = sp + x
+            elif kind == CALL:
+                sp = ram[0]
+                ram[sp] = z
+                ram[sp + 1], ram[sp + 2], ram[sp + 3], ram[sp + 4] = (
+                    ram[1],
+                    ram[2],
+                    ram[3],
+                    ram[4],
+                )
+                touched[sp : sp + 5] = b"\x01" * 5
+                touched[0:5] = b"\x01" * 5
+                ram[0] = ram[1] = sp + 5
+                ram[2] = sp - y
+                index = x
+            elif kind == CALL_NATIVE:
+                sp = ram[0] - y
+                value = natives[x](*ram[sp : sp + y])
+                ram[sp] = value
+                touched[sp : sp + y + 1] = b"\x01" * (y + 1)
+                touched[0] = 1
+                ram[0] = sp + 1
+                if jack_os is not None and jack_os.halted:
+                    self.halted = True
+                    break
+            elif kind == RETURN:
+                frame = ram[1]
+                return_address = ram[frame - 5]
+                ram[FRAME_REGISTER] = frame
+                ram[RETURN_REGISTER] = return_address
+                sp, argument = ram[0] - 1, ram[2]
+                ram[argument] = ram[sp]
+                ram[0] = argument + 1
+                ram[4], ram[3], ram[2], ram[1] = (
+                    ram[frame - 1],
+                    ram[frame - 2],
+                    ram[frame - 3],
+                    ram[frame - 4],
+                )
+                for address in (sp, argument, frame - 5, frame - 4, frame - 3):
+                    touched[address] = 1
+                touched[frame - 2] = touched[frame - 1] = 1
+                touched[0:5] = b"\x01" * 5
+                touched[FRAME_REGISTER] = touched[RETURN_REGISTER] = 1
+                index = returns.get(return_address, size)
+            else:
+                ram[x] = y
+                touched[x] = 1
+
+        self.index = index
+        self.pc_register += executed
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from typing import Collection, Iterable, NamedTuple
+
+from n2t.core.jack_os import SYS_INIT
+from n2t.core.vm_translator.facade import VMTranslator
+from n2t.core.vm_translator.parser import arg1, arg2, command_type, segments
+
+PUSH_CONSTANT = 0
+PUSH_FIXED = 1
+PUSH_SEGMENT = 2
+POP_FIXED = 3
+POP_SEGMENT = 4
+ADD = 5
+SUB = 6
+EQ = 7
+GT = 8
+LT = 9
+AND = 10
+OR = 11
+NEG = 12
+NOT = 13
+GOTO = 14
+IF_GOTO = 15
+FUNCTION = 16
+CALL = 17
+RETURN = 18
+SET = 19
+CALL_NATIVE = 20
+
+ARITHMETIC = {
+    "add": ADD,
+    "sub": SUB,
+    "neg": NEG,
+    "eq": EQ,
+    "gt": GT,
+    "lt": LT,
+    "and": AND,
+    "or": OR,
+    "not": NOT,
+}
+TEMP_BASE = 5
+POINTER_BASE = 3
+STATIC_BASE = 16
+
+# the registers the translated bootstrap initializes before calling Sys.init
+BOOTSTRAP = ((0, 256), (1, -1), (2, -2), (3, -3), (4, -4))
+
+
+class Operation(NamedTuple):
+    kind: int
+    x: int = 0
+    y: int = 0
+    z: int = 0
+
+
+class VMProgram(NamedTuple):
+    operations: list[Operation]
+    returns: dict[int, int]
+    natives: list[str]
+
+
+def load(
+    vm_language: Iterable[str],
+    boot: bool = False,
+    name: str = "",
+    natives: Collection[str] = (),
+) -> VMProgram:
+    # The translator is replayed command by command so that return addresses
+    # and static variables get the same values as in the assembled program
+    translator = VMTranslator.create()
+    translator.set_function_name(name)
+    operations: list[Operation] = list()
+    returns: dict[int, int] = dict()
+    labels: dict[str, int] = dict()
+    references: list[tuple[int, str]] = list()
+    statics: dict[str, int] = dict()
+    linked: dict[str, int] = dict()
+    rom, translated = 0, 0
+
+    vm_language = list(vm_language)
+    if boot and natives and "Sys.init" not in _functions(vm_language):
+        vm_language.extend(SYS_INIT)
+
+    if boot:
+        translator.write_bootstrap()
+        rom, translated = _size(translator.translations), len(translator.translations)
+        operations.extend(Operation(SET, *register) for register in BOOTSTRAP)
+        references.append((len(operations), "Sys.init"))
+        operations.append(Operation(CALL, 0, 0, rom))
+        returns[rom] = len(operations)
+
+    for instruction in vm_language:
+        cmd_type = command_type(instruction)
+        if cmd_type == "ERROR":
+            continue
+        scope = translator.function_name
+        translator.translate([instruction], False)
+        rom += _size(translator.translations[translated:])
+        translated = len(translator.translations)
+
+        if cmd_type == "C_ARITHMETIC":
+            operations.append(Operation(ARITHMETIC[arg1(instruction)]))
+        elif cmd_type == "C_LABEL":
+            labels[f"{scope}${arg1(instruction)}"] = len(operations)
+        elif cmd_type in ("C_GOTO", "C_IF"):
+            references.append((len(operations), f"{scope}${arg1(instruction)}"))
+            operations.append(Operation(GOTO if cmd_type == "C_GOTO" else IF_GOTO))
+        elif cmd_type == "C_FUNCTION":
+            labels[arg1(instruction)] = len(operations)
+            operations.append(Operation(FUNCTION, arg2(instruction)))
+        elif cmd_type == "C_CALL" and arg1(instruction) in natives:
+            native = linked.setdefault(arg1(instruction), len(linked))
+            operations.append(Operation(CALL_NATIVE, native, arg2(instruction)))
+        elif cmd_type == "C_CALL":
+            references.append((len(operations), arg1(instruction)))
+            operations.append(Operation(CALL, 0, arg2(instruction), rom))
+            returns[rom] = len(operations)
+        elif cmd_type == "C_RETURN":
+            operations.append(Operation(RETURN))
+        else:
+            operations.append(_push_pop(instruction, scope, statics))
+
+    for index, label in references:
+        if label not in labels:
+            raise ValueError(f"Undefined label or function: {label}")
+        operations[index] = operations[index]._replace(x=labels[label])
+    return VMProgram(operations, returns, list(linked))
+
+
+def _push_pop(instruction: str, scope: str, statics: dict[str, int]) -> Operation:
+    segment, i = arg1(instruction), arg2(instruction)
+    push = command_type(instruction) == "C_PUSH"
+    if segment == "constant":
+        return Operation(PUSH_CONSTANT, i)
+    if segment in segments:
+        return Operation(PUSH_SEGMENT if push else POP_SEGMENT, segments[segment], i)
+
+    if segment == "static":
+        address = statics.setdefault(
+            f"{scope.split('.')[0]}.{i}", STATIC_BASE + len(statics)
+        )
+    elif segment == "temp":
+        address = TEMP_BASE + i
+    else:
+        address = POINTER_BASE + (i == 1)
+    return Operation(PUSH_FIXED if push else POP_FIXED, address)
+
+
+def _functions(vm_language: list[str]) -> set[str]:
+    return {
+        arg1(instruction)
+        for instruction in vm_language
+        if command_type(instruction) == "C_FUNCTION"
+    }
+
+
+def _size(translations: list[str]) -> int:
+    return sum(1 for line in translations if not line.startswith("("))
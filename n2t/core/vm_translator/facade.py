@@ -205,7 +205,7 @@ class VMTranslator:
         if segment == "static":
             self.translations.append(f"@{self.function_name.split('.')[0]}.{i}")
         elif segment == "temp":
-            self.translations.append(f"@{str(5+int(i))}")
+            self.translations.append(f"@{str(5 + int(i))}")
         elif segment == "pointer":
             segment_pointer = get_segment_pointer("this")
             if i == "1":
@@ -1,13 +1,18 @@
-from n2t.infra.asm import AsmProgram
+from n2t.infra.asm import AsmBatch, AsmProgram
 from n2t.infra.hack import HackProgram
 from n2t.infra.io import FileFormat
 from n2t.infra.jack import JackProgram
+from n2t.infra.trace import TraceFile
+from n2t.infra.tst import TstProgram
 from n2t.infra.vm import VmProgram
 
 __all__ = [
     "FileFormat",
+    "AsmBatch",
     "AsmProgram",
     "HackProgram",
     "JackProgram",
+    "TstProgram",
+    "TraceFile",
     "VmProgram",
 ]
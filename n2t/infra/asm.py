@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import cache
+from itertools import repeat
 from pathlib import Path
 from typing import Iterable, Iterator, Protocol
 
 from n2t.core import Assembler as DefaultAssembler
+from n2t.core.cpu_emulator import rom
 from n2t.infra.io import File, FileFormat
 
 
@@ -20,7 +26,11 @@ class AsmProgram:
     def __post_init__(self) -> None:
         FileFormat.asm.validate(self.path)
 
-    def assemble(self) -> None:
+    def assemble(self, packed: bool = False) -> None:
+        if packed:
+            words = (int(word, base=2) for word in self.assembler.assemble(self))
+            FileFormat.rom.convert(self.path).write_bytes(rom.pack(words))
+            return
         hack_file = File(FileFormat.hack.convert(self.path))
         hack_file.save(self.assembler.assemble(self))
 
@@ -28,6 +38,58 @@ class AsmProgram:
         yield from File(self.path).load()
 
 
+@dataclass
+class AsmBatch:
+    paths: list[Path]
+    jobs: int = 1
+    packed: bool = False
+
+    @classmethod
+    def load_from(
+        cls, file_directory_or_pattern: str, jobs: int = 1, packed: bool = False
+    ) -> AsmBatch:
+        path = Path(file_directory_or_pattern)
+        if path.is_dir():
+            paths = sorted(path.rglob("*.asm"))
+        elif glob.has_magic(file_directory_or_pattern):
+            matches = glob.glob(file_directory_or_pattern, recursive=True)
+            paths = sorted(Path(match) for match in matches if match.endswith(".asm"))
+        else:
+            paths = [path]
+        return cls(paths, jobs, packed)
+
+    def assemble(self) -> list[tuple[Path, str | None]]:
+        workers = self.jobs or os.cpu_count() or 1
+        if workers == 1 or len(self.paths) < 2:
+            errors = [assemble_file(path, self.packed) for path in self.paths]
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                # map keeps input order, so the report does not depend on timing
+                errors = list(
+                    pool.map(
+                        assemble_file,
+                        self.paths,
+                        repeat(self.packed),
+                        chunksize=max(1, len(self.paths) // (4 * workers)),
+                    )
+                )
+        return list(zip(self.paths, errors))
+
+
+def assemble_file(path: Path, packed: bool) -> str | None:
+    try:
+        AsmProgram(path, _worker_assembler()).assemble(packed)
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+    return None
+
+
+# one assembler per process; it resets its symbols for every file
+@cache
+def _worker_assembler() -> Assembler:
+    return DefaultAssembler.create()
+
+
 class Assembler(Protocol):  # pragma: no cover
     def assemble(self, assembly: Iterable[str]) -> Iterable[str]:
         pass
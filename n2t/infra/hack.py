@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Iterable, Iterator, Protocol
 
 from n2t.core import Disassembler as DefaultDisassembler
-from n2t.infra.io import File, FileFormat
+from n2t.infra.io import File, FileFormat, load_packed
 
 
 @dataclass
@@ -14,7 +14,8 @@ class HackProgram:
     disassembler: Disassembler = field(default_factory=DefaultDisassembler.create)
 
     def __post_init__(self) -> None:
-        FileFormat.hack.validate(self.path)
+        if self.path.suffix != FileFormat.rom.value:
+            FileFormat.hack.validate(self.path)
 
     @classmethod
     def load_from(cls, file_name: str) -> HackProgram:
@@ -25,7 +26,10 @@ class HackProgram:
         assembly_file.save(self.disassembler.disassemble(self))
 
     def __iter__(self) -> Iterator[str]:
-        yield from File(self.path).load()
+        if self.path.suffix == FileFormat.rom.value:
+            yield from (f"{word:016b}" for word in load_packed(self.path))
+        else:
+            yield from File(self.path).load()
 
 
 class Disassembler(Protocol):  # pragma: no cover
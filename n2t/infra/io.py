@@ -1,20 +1,36 @@
 from __future__ import annotations
 
 import glob
+import mmap
 import os
+from array import array
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Iterable
 
+from n2t.core.cpu_emulator import rom
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
 
 class FileFormat(Enum):
     xml = ".xml"
     hack = ".hack"
+    rom = ".rom"
     asm = ".asm"
     vm = ".vm"
     jack = ".jack"
     json = ".json"
+    jsonl = ".jsonl"
+    bin = ".bin"
+    npy = ".npy"
+    tst = ".tst"
+    cmp = ".cmp"
+    out = ".out"
+    pbm = ".pbm"
+    pgm = ".pgm"
+    trace = ".trace"
 
     def validate(self, path: Path) -> None:
         assert path.suffix == self.value
@@ -37,6 +53,22 @@ class File:
                 file.write(f"{line}\n")
 
 
+def npy(words: bytes, count: int) -> bytes:
+    header = f"{{'descr': '<i2', 'fortran_order': False, 'shape': ({count},), }}"
+    # magic, version and header length take 10 bytes; data starts 64-byte aligned
+    padding = -(10 + len(header) + 1) % 64
+    header += " " * padding + "\n"
+    return NPY_MAGIC + len(header).to_bytes(2, "little") + header.encode() + words
+
+
+def load_packed(path: Path) -> array[int]:
+    with (
+        path.open("rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        return rom.unpack(data)
+
+
 def remove_files(pattern: str) -> None:
     for file in glob.glob(pattern):
         os.remove(file)
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Iterator, Protocol
+from typing import Callable, Iterable, Iterator, Mapping, Protocol, Sequence, TextIO
 
 from n2t.core import Assembler, Disassembler
 from n2t.core import Assembler as DefaultAssembler
 from n2t.core import Disassembler as DefaultDisassembler
 from n2t.core import Emulator as DefaultEmulator
-from n2t.infra.io import File, FileFormat
+from n2t.core import VMEmulator as DefaultVMEmulator
+from n2t.core.cpu_emulator.keyboard import Keyboard
+from n2t.core.cpu_emulator.memory import RAM_SIZE, Memory, parse_ranges
+from n2t.infra.hack import HackProgram
+from n2t.infra.io import File, FileFormat, load_packed, npy
+from n2t.infra.shared import SharedRam
+from n2t.infra.stopwatch import CHECK_EVERY, MIB, MILLION, Stopwatch, peak_rss
+from n2t.infra.vm import list_vm_files
 
 
 @dataclass
@@ -19,34 +27,332 @@ class Program:
     emulator: Emulator = field(default_factory=DefaultEmulator.create)
     assembler: Assembler = field(default_factory=DefaultAssembler.create)
     disassembler: Disassembler = field(default_factory=DefaultDisassembler.create)
+    vm_emulator: VMEmulator = field(default_factory=DefaultVMEmulator.create)
+    round_trip: bool = False
+    jit: bool = False
+    profile: bool = False
+    native_os: bool = False
+    save_state: Path | None = None
+    resume_from: Path | None = None
+    frame_every: int | None = None
+    frame_format: FileFormat = FileFormat.pbm
+    keyboard: Keyboard | None = None
+    trace: bool = False
+    max_seconds: float | None = None
+    progress_every: int | None = None
+    dump_every: int | None = None
+    dump_ranges: list[range] = field(default_factory=lambda: [range(RAM_SIZE)])
+    ram_format: FileFormat = FileFormat.json
+    shared_ram: SharedRam | None = None
+    log: Callable[[str], None] = field(default=print, repr=False)
+    stopwatch: Stopwatch = field(default_factory=Stopwatch, repr=False)
+    timed_out: bool = False
 
     @classmethod
-    def load_from(cls, file_name: str, cycles: int) -> Program:
+    def load_from(
+        cls,
+        file_name: str,
+        cycles: int,
+        *,
+        jit: bool = False,
+        round_trip: bool = False,
+        profile: bool = False,
+        save_state: str | None = None,
+        resume_from: str | None = None,
+        native_os: bool = False,
+        frame_every: int | None = None,
+        frame_format: str = "pbm",
+        keyboard: str | None = None,
+        trace: int = 0,
+        max_seconds: float | None = None,
+        progress_every: int | None = None,
+        dump_every: int | None = None,
+        dump: str | None = None,
+        ram_format: str = "json",
+        ram_file: str | None = None,
+        ram_segment: str | None = None,
+        log: Callable[[str], None] = print,
+    ) -> Program:
         path = Path(file_name)
         if not path.is_absolute():
             path = Path.cwd() / path
-        return cls(path, file_name, cycles)
+        keys = None
+        if keyboard is not None:
+            try:
+                keys = Keyboard.parse(Path(keyboard).read_text())
+            except (OSError, ValueError) as error:
+                raise ValueError(f"Bad keyboard script {keyboard}: {error}") from error
+        shared_ram = None
+        try:
+            if ram_file is not None:
+                shared_ram = SharedRam.map_file(Path(ram_file))
+            elif ram_segment is not None:
+                shared_ram = SharedRam.create_segment(ram_segment)
+        except OSError as error:
+            raise ValueError(f"Cannot set up shared RAM: {error}") from error
+        ram = Memory() if shared_ram is None else Memory(shared_ram.words)
+        try:
+            return cls(
+                path,
+                file_name,
+                cycles,
+                DefaultEmulator.create(jit, profile, native_os, trace, ram),
+                round_trip=round_trip,
+                jit=jit,
+                profile=profile,
+                native_os=native_os,
+                save_state=None if save_state is None else Path(save_state),
+                resume_from=None if resume_from is None else Path(resume_from),
+                vm_emulator=DefaultVMEmulator.create(native_os, ram),
+                frame_every=frame_every,
+                frame_format=FileFormat(f".{frame_format}"),
+                keyboard=keys,
+                trace=trace > 0,
+                max_seconds=max_seconds,
+                progress_every=progress_every,
+                dump_every=dump_every,
+                dump_ranges=[range(RAM_SIZE)] if dump is None else parse_ranges(dump),
+                ram_format=FileFormat(f".{ram_format}"),
+                shared_ram=shared_ram,
+                log=log,
+            )
+        except ValueError:
+            if shared_ram is not None:
+                shared_ram.close()
+            raise
 
     def __post_init__(self) -> None:
-        if self.path.suffix == ".asm":
+        self.check_options()
+        if self.round_trip:
+            self.write_round_trip()
+
+    def check_options(self) -> None:
+        if self.native_os and (self.save_state or self.resume_from):
+            raise ValueError("Snapshots do not include the native Jack OS state")
+        if self.frame_format not in (FileFormat.pbm, FileFormat.pgm):
+            raise ValueError("Frames can only be written as pbm or pgm")
+        if self.ram_format not in (FileFormat.json, FileFormat.bin, FileFormat.npy):
+            raise ValueError("RAM can only be dumped as json, bin or npy")
+        whole_ram = self.dump_ranges == [range(RAM_SIZE)]
+        if self.ram_format is not FileFormat.json and not whole_ram:
+            raise ValueError("Address ranges only apply to json RAM dumps")
+        used = [option for option, value in self.cpu_options().items() if value]
+        if used and self.is_vm():
+            raise ValueError(f"{', '.join(used)}: not supported for VM programs")
+
+    def cpu_options(self) -> dict[str, bool]:
+        return {
+            "--jit": self.jit,
+            "--profile": self.profile,
+            "--save-state": self.save_state is not None,
+            "--resume-from": self.resume_from is not None,
+            "--trace": self.trace,
+            "--round-trip": self.round_trip,
+        }
+
+    def write_round_trip(self) -> None:
+        if self.path.suffix == FileFormat.asm.value:
             hack_file = File(FileFormat.hack.convert(self.path))
             hack_file.save(self.assembler.assemble(self))
-            self.path = Path(FileFormat.hack.convert(self.path))
-            assembly_file = File(Path(self.file_name[:-4] + "1.asm"))
-        else:
-            assembly_file = File(Path(self.file_name[:-5] + "1.asm"))
+            self.path = hack_file.path
+        name = Path(self.file_name)
+        assembly_file = File(name.with_name(f"{name.stem}1.asm"))
 
-        assembly_file.save(self.disassembler.disassemble(self))
+        # HackProgram reads both text .hack files and packed .rom files
+        assembly_file.save(self.disassembler.disassemble(HackProgram(self.path)))
         self.path = Path(assembly_file.path)
 
     def execute(self) -> None:
-        json_file = File(FileFormat.json.convert(Path(self.file_name)))
-        json_file.save(self.emulator.emulate(self, self.cycles))
+        try:
+            self.run_emulator()
+        finally:
+            if self.shared_ram is not None:
+                self.shared_ram.close()
+
+    def run_emulator(self) -> None:
+        if self.resume_from is not None:
+            self.emulator.restore(self.resume_from.read_bytes())
+        if self.keyboard is not None:
+            self.runner.play(self.keyboard)
+        if self.frame_every is not None:
+            self.runner.schedule(
+                self.runner.pc_register + self.frame_every, self.write_frame
+            )
+        self.start_clock()
+        with self.ram_log():
+            self.save_ram(self.emulate())
+        if self.save_state is not None:
+            self.save_state.write_bytes(self.emulator.snapshot())
+        if self.trace:
+            trace_file = FileFormat.trace.convert(Path(self.file_name))
+            trace_file.write_bytes(self.emulator.trace_data())
+
+    def start_clock(self) -> None:
+        cycle = self.runner.pc_register
+        self.stopwatch = Stopwatch(cycle)
+        if self.max_seconds is not None:
+            self.runner.schedule(cycle + CHECK_EVERY, self.check_deadline)
+        if self.progress_every is not None:
+            self.runner.schedule(
+                cycle + self.progress_every * MILLION, self.report_progress
+            )
+
+    def check_deadline(self) -> int | None:
+        assert self.max_seconds is not None
+        if self.stopwatch.elapsed() < self.max_seconds:
+            return self.runner.pc_register + CHECK_EVERY
+        self.timed_out = True
+        self.runner.stop()
+        return None
+
+    def report_progress(self) -> int:
+        assert self.progress_every is not None
+        cycle = self.runner.pc_register
+        self.log(self.stopwatch.summary(cycle))
+        return cycle + self.progress_every * MILLION
+
+    def report(self) -> list[str]:
+        lines = list()
+        if self.timed_out:
+            lines.append(f"Stopped at the {self.max_seconds:g}s time limit")
+        summary = f"Executed {self.stopwatch.summary(self.runner.pc_register)}"
+        rss = peak_rss()
+        if rss is not None:
+            summary += f", peak RSS {rss / MIB:.1f} MiB"
+        return lines + [summary]
+
+    def save_ram(self, lines: Iterable[str]) -> None:
+        ram_file = self.ram_format.convert(Path(self.file_name))
+        if self.ram_format is FileFormat.bin:
+            ram_file.write_bytes(self.runner.ram_image())
+        elif self.ram_format is FileFormat.npy:
+            ram_file.write_bytes(npy(self.runner.ram_image(), RAM_SIZE))
+        elif self.dump_ranges == [range(RAM_SIZE)]:
+            File(ram_file).save(lines)
+        else:
+            File(ram_file).save(self.runner.ram_json(self.dump_ranges))
+
+    @contextmanager
+    def ram_log(self) -> Iterator[None]:
+        if self.dump_every is None:
+            yield
+            return
+        log_file = FileFormat.jsonl.convert(Path(self.file_name))
+        with log_file.open("w", newline="") as stream:
+            self.runner.schedule(
+                self.runner.pc_register + self.dump_every,
+                lambda: self.write_changes(stream),
+            )
+            yield
+
+    def write_changes(self, stream: TextIO) -> int:
+        assert self.dump_every is not None
+        cycle = self.runner.pc_register
+        cells = ", ".join(f'"{a}": {v}' for a, v in self.runner.ram_changes())
+        stream.write(f'{{"cycle": {cycle}, "RAM": {{{cells}}}}}\n')
+        return cycle + self.dump_every
+
+    def write_frame(self) -> int:
+        assert self.frame_every is not None
+        cycle = self.runner.pc_register
+        name = Path(self.file_name)
+        frame_file = name.with_name(f"{name.stem}-{cycle}{self.frame_format.value}")
+        frame_file.write_bytes(self.runner.frame(self.frame_format.value[1:]))
+        return cycle + self.frame_every
+
+    def emulate(self) -> Iterable[str]:
+        if self.is_vm():
+            files = list_vm_files(self.path) if self.path.is_dir() else [self.path]
+            vm_language = [line for file in files for line in File(file).load()]
+            # a native OS supplies Sys.init for a directory that lacks one
+            boot = len(files) > 1 or (self.path.is_dir() and self.native_os)
+            return self.vm_emulator.emulate(
+                vm_language, self.cycles, boot, self.path.stem
+            )
+        if self.round_trip:
+            return self.emulator.emulate(self, self.cycles)
+        if self.path.suffix == FileFormat.asm.value:
+            words = self.assembler.assemble(self)
+            self.emulator.link(self.assembler.symbol_table.labels)
+            return self.emulator.emulate_hack(words, self.cycles)
+        if self.path.suffix == FileFormat.rom.value:
+            return self.emulator.emulate_packed(load_packed(self.path), self.cycles)
+        return self.emulator.emulate_hack(self, self.cycles)
+
+    def is_vm(self) -> bool:
+        return self.path.is_dir() or self.path.suffix == FileFormat.vm.value
+
+    @property
+    def runner(self) -> Runner:
+        return self.vm_emulator if self.is_vm() else self.emulator
+
+    def profile_report(self) -> list[str]:
+        return self.emulator.profile_report(self.assembler.symbol_table.labels)
 
     def __iter__(self) -> Iterator[str]:
         yield from File(self.path).load()
 
 
-class Emulator(Protocol):  # pragma: no cover
+class Runner(Protocol):  # pragma: no cover
+    pc_register: int
+    halted: bool
+
+    def ended(self) -> bool:
+        pass
+
+    def console(self) -> list[str]:
+        pass
+
+    def schedule(self, cycle: int, action: Callable[[], int | None]) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def ram_changes(self) -> list[tuple[int, int]]:
+        pass
+
+    def ram_json(self, ranges: Sequence[range]) -> Iterable[str]:
+        pass
+
+    def ram_image(self) -> bytes:
+        pass
+
+    def frame(self, image_format: str) -> bytes:
+        pass
+
+    def play(self, keyboard: Keyboard) -> None:
+        pass
+
+
+class Emulator(Runner, Protocol):  # pragma: no cover
     def emulate(self, assembly: Iterable[str], cycles: int) -> Iterable[str]:
         pass
+
+    def emulate_hack(self, words: Iterable[str], cycles: int) -> Iterable[str]:
+        pass
+
+    def emulate_packed(self, words: Iterable[int], cycles: int) -> Iterable[str]:
+        pass
+
+    def profile_report(self, labels: Mapping[str, int]) -> list[str]:
+        pass
+
+    def snapshot(self) -> bytes:
+        pass
+
+    def restore(self, data: bytes) -> None:
+        pass
+
+    def link(self, labels: Mapping[str, int]) -> None:
+        pass
+
+    def trace_data(self) -> bytes:
+        pass
+
+
+class VMEmulator(Runner, Protocol):  # pragma: no cover
+    def emulate(
+        self, vm_language: Iterable[str], cycles: int, boot: bool, name: str
+    ) -> Iterable[str]:
+        pass
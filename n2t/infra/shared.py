@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import mmap
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+from n2t.core.cpu_emulator.memory import RAM_SIZE, shared_words
+
+
+@dataclass
+class SharedRam:
+    words: memoryview
+    buffer: mmap.mmap | SharedMemory
+
+    @classmethod
+    def map_file(cls, path: Path) -> SharedRam:
+        with path.open("w+b") as file:
+            file.truncate(2 * RAM_SIZE)
+            buffer = mmap.mmap(file.fileno(), 2 * RAM_SIZE)
+        return cls(shared_words(buffer), buffer)
+
+    @classmethod
+    def create_segment(cls, name: str) -> SharedRam:
+        segment = SharedMemory(name, create=True, size=2 * RAM_SIZE)
+        assert segment.buf is not None
+        # some platforms round the segment up to a whole page
+        return cls(shared_words(segment.buf[: 2 * RAM_SIZE]), segment)
+
+    def close(self) -> None:
+        self.words.release()
+        self.buffer.close()
+        if isinstance(self.buffer, SharedMemory):
+            self.buffer.unlink()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from time import perf_counter
+
+# cycles between two looks at the wall clock
+CHECK_EVERY = 100_000
+MILLION = 1_000_000
+MIB = 1 << 20
+
+
+@dataclass
+class Stopwatch:
+    first_cycle: int = 0
+    started: float = field(default_factory=perf_counter)
+
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+    def summary(self, cycle: int) -> str:
+        executed, elapsed = cycle - self.first_cycle, self.elapsed()
+        rate = executed / elapsed if elapsed else 0.0
+        return f"{executed:,} cycles in {elapsed:.2f}s ({rate:,.0f} cycles/s)"
+
+
+def peak_rss() -> int | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
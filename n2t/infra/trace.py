@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from n2t.core.cpu_emulator.trace import Trace
+from n2t.infra.io import FileFormat
+
+
+@dataclass
+class TraceFile:
+    path: Path
+
+    @classmethod
+    def load_from(cls, file_name: str) -> TraceFile:
+        return cls(Path(file_name))
+
+    def __post_init__(self) -> None:
+        FileFormat.trace.validate(self.path)
+
+    def load(self) -> Trace:
+        return Trace.from_bytes(self.path.read_bytes())
+
+    def describe(self, last: int | None = None) -> list[str]:
+        trace = self.load()
+        lines = [record.describe() for record in trace]
+        dropped = trace.recorded - len(trace)
+        header = [f"{len(trace)} of {trace.recorded} instructions"]
+        if dropped:
+            header[0] += f" ({dropped} older ones dropped)"
+        return header + (lines if last is None else lines[-last:])
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from n2t.core import Assembler, ScriptRunner
+from n2t.core.script.facade import compare
+from n2t.infra.io import File, FileFormat
+
+
+@dataclass
+class TstProgram:
+    path: Path
+    output: list[str] = field(default_factory=list)
+
+    @classmethod
+    def load_from(cls, file_name: str) -> TstProgram:
+        return cls(Path(file_name))
+
+    def __post_init__(self) -> None:
+        FileFormat.tst.validate(self.path)
+
+    def run(self) -> int | None:
+        runner = ScriptRunner.create(self.load_words)
+        self.output = runner.run(self.path.read_text())
+        if runner.output_file is not None:
+            File(self.path.parent.joinpath(runner.output_file)).save(self.output)
+        if runner.compare_to is None:
+            return None
+        expected = File(self.path.parent.joinpath(runner.compare_to)).load()
+        return compare(self.output, list(expected))
+
+    def load_words(self, file_name: str) -> Iterable[str]:
+        path = self.path.parent.joinpath(file_name)
+        if path.suffix == FileFormat.asm.value:
+            return Assembler.create().assemble(list(File(path).load()))
+        FileFormat.hack.validate(path)
+        return list(File(path).load())
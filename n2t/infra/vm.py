@@ -28,7 +28,7 @@ class VmProgram:  # TODO: your work for Projects 7 and 8 starts here
         is_continuous_system = False
         if path.is_dir():
             # If it's a directory, gather all VM files
-            vm_files = list(path.glob("*.vm"))
+            vm_files = list_vm_files(path)
             if len(vm_files) > 1:
                 is_continuous_system = True
 
@@ -59,6 +59,10 @@ class VmProgram:  # TODO: your work for Projects 7 and 8 starts here
         yield from File(self.path).load()
 
 
+def list_vm_files(directory: Path) -> list[Path]:
+    return sorted(directory.glob("*.vm"))
+
+
 class VMTranslator(Protocol):  # pragma: no cover
     def translate(self, vm_language: Iterable[str], boot: bool) -> Iterable[str]:
         pass
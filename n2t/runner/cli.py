@@ -1,8 +1,30 @@
-from typer import Option, Typer, echo
+from enum import Enum
+from typing import Annotated
 
-from n2t.infra import AsmProgram, HackProgram, JackProgram, VmProgram
+from typer import BadParameter, Exit, Option, Typer, echo
+
+from n2t.infra import (
+    AsmBatch,
+    HackProgram,
+    JackProgram,
+    TraceFile,
+    TstProgram,
+    VmProgram,
+)
 from n2t.infra.json import Program
 
+
+class FrameFormat(str, Enum):
+    pbm = "pbm"
+    pgm = "pgm"
+
+
+class RamFormat(str, Enum):
+    json = "json"
+    bin = "bin"
+    npy = "npy"
+
+
 cli = Typer(
     name="Nand 2 Tetris Software",
     no_args_is_help=True,
@@ -18,9 +40,26 @@ def run_disassembler(hack_file: str) -> None:
 
 
 @cli.command("assemble", no_args_is_help=True)
-def run_assembler(assembly_file: str) -> None:
-    echo(f"Assembling {assembly_file}")
-    AsmProgram.load_from(assembly_file).assemble()
+def run_assembler(
+    asm_file_directory_or_pattern: str,
+    packed: Annotated[
+        bool, Option(help="Write packed binary words to a .rom file.")
+    ] = False,
+    jobs: Annotated[
+        int, Option(min=0, help="Assemble N files at once; 0 uses every CPU.")
+    ] = 1,
+) -> None:
+    echo(f"Assembling {asm_file_directory_or_pattern}")
+    results = AsmBatch.load_from(asm_file_directory_or_pattern, jobs, packed).assemble()
+    if not results:
+        echo(f"No .asm files match {asm_file_directory_or_pattern}")
+        raise Exit(1)
+    failures = [(path, error) for path, error in results if error is not None]
+    for path, error in failures:
+        echo(f"{path}: {error}")
+    echo(f"Assembled {len(results) - len(failures)} of {len(results)} files")
+    if failures:
+        raise Exit(1)
     echo("Done!")
 
 
@@ -41,8 +80,102 @@ def run_compiler(jack_file_or_directory: str) -> None:
 @cli.command("execute", no_args_is_help=True)
 def run_cpu_emulator(
     jack_or_asm_file_or_directory: str,
-    cycles: int = Option(100, help="Number of cycles to run."),
+    cycles: int = Option(100, help="Number of cycles (VM commands for .vm) to run."),
+    jit: bool = Option(False, help="Compile basic blocks before running them."),
+    until_halt: bool = Option(False, help="Run until the program halts."),
+    max_cycles: int = Option(10_000_000, help="Cycle cap for --until-halt."),
+    round_trip: bool = Option(
+        False, help="Run from written .hack and disassembled .asm files."
+    ),
+    profile: bool = Option(False, help="Report the hottest instructions."),
+    save_state: str | None = Option(None, help="Write a snapshot after the run."),
+    resume_from: str | None = Option(None, help="Start from a saved snapshot."),
+    native_os: bool = Option(False, help="Run Jack OS routines natively."),
+    frame_every: int | None = Option(
+        None, min=1, help="Dump the screen every N cycles."
+    ),
+    frame_format: FrameFormat = Option(FrameFormat.pbm, help="Screen dump format."),
+    keyboard: str | None = Option(None, help="Keyboard script to play."),
+    trace: int = Option(0, help="Keep the last N instructions in a .trace file."),
+    max_seconds: float | None = Option(None, help="Stop after this many seconds."),
+    progress_every: int | None = Option(
+        None, min=1, help="Report progress every N million cycles."
+    ),
+    dump_every: int | None = Option(
+        None,
+        min=1,
+        help="Append the RAM cells changed every N cycles to a .jsonl file.",
+    ),
+    dump: str | None = Option(
+        None, help="Only dump these addresses to .json, e.g. 0-15,256-2047."
+    ),
+    ram_format: RamFormat = Option(
+        RamFormat.json, help="RAM dump format: json, bin (raw words) or npy."
+    ),
+    ram_file: str | None = Option(None, help="Keep RAM in this memory-mapped file."),
+    ram_segment: str | None = Option(
+        None, help="Keep RAM in a named shared memory segment."
+    ),
 ) -> None:
     echo(f"Executing {jack_or_asm_file_or_directory}")
-    Program.load_from(jack_or_asm_file_or_directory, cycles).execute()
+    try:
+        program = Program.load_from(
+            jack_or_asm_file_or_directory,
+            max_cycles if until_halt else cycles,
+            jit=jit,
+            round_trip=round_trip,
+            profile=profile,
+            save_state=save_state,
+            resume_from=resume_from,
+            native_os=native_os,
+            frame_every=frame_every,
+            frame_format=frame_format.value,
+            keyboard=keyboard,
+            trace=trace,
+            max_seconds=max_seconds,
+            progress_every=progress_every,
+            dump_every=dump_every,
+            dump=dump,
+            ram_format=ram_format.value,
+            ram_file=ram_file,
+            ram_segment=ram_segment,
+            log=echo,
+        )
+    except ValueError as error:
+        raise BadParameter(str(error)) from error
+    program.execute()
+    if until_halt:
+        executed = program.runner.pc_register
+        if program.runner.halted:
+            echo(f"Halted after {executed} cycles")
+        elif program.runner.ended():
+            echo(f"Ran off the end of the program after {executed} cycles")
+        else:
+            echo(f"Did not halt within {executed} cycles")
+    for line in program.report():
+        echo(line)
+    for line in program.profile_report():
+        echo(line)
+    for line in program.runner.console():
+        if line:
+            echo(line)
     echo("Done!")
+
+
+@cli.command("test", no_args_is_help=True)
+def run_test_script(tst_file: str) -> None:
+    echo(f"Testing {tst_file}")
+    failure = TstProgram.load_from(tst_file).run()
+    if failure is not None:
+        echo(f"Comparison failure at line {failure}")
+        raise Exit(1)
+    echo("End of script - Comparison ended successfully")
+
+
+@cli.command("trace", no_args_is_help=True)
+def show_trace(
+    trace_file: str,
+    last: int | None = Option(None, help="Only show the last N instructions."),
+) -> None:
+    for line in TraceFile.load_from(trace_file).describe(last):
+        echo(line)
@@ -1,10 +1,12 @@
 import os
+import shutil
 import subprocess
 from pathlib import Path
 from typing import Iterable
 
 import pytest
 
+from n2t.infra import TstProgram
 from n2t.infra.io import remove_files
 from n2t.runner.cli import run_vm_translator
 
@@ -77,3 +79,35 @@ def run_vm_translator_test(
     assert "end of script - comparison ended successfully" in output.lower()
     remove_files(pattern=str(Path(projects_directory_path).joinpath("*.asm")))
     remove_files(pattern=str(Path(projects_directory_path).joinpath("*.out")))
+
+
+def run_vm_translator_native_test(
+    vm_directory: Path,
+    tmp_path: Path,
+    test_file: tuple[str, str],
+    vm_file: str = "",
+) -> None:
+    project_part, directory_name = test_file
+    directory = tmp_path.joinpath(directory_name)
+    shutil.copytree(vm_directory.joinpath(project_part, directory_name), directory)
+
+    run_vm_translator(str(directory.joinpath(vm_file)))
+
+    assert (
+        TstProgram.load_from(str(directory.joinpath(directory_name + ".tst"))).run()
+        is None
+    )
+
+
+@pytest.fixture(scope="module")
+def vm_directory(pytestconfig: pytest.Config) -> Iterable[Path]:
+    name = pytestconfig.rootpath.joinpath("tests", "e2e", "vm")
+
+    yield name
+
+
+@pytest.fixture(scope="module")
+def cpu_tests_directory(pytestconfig: pytest.Config) -> Iterable[Path]:
+    name = pytestconfig.rootpath.joinpath("tests", "e2e", "cpu_tests")
+
+    yield name
@@ -1,9 +1,12 @@
 import filecmp
+import shutil
 from pathlib import Path
 
 import pytest
+from typer.testing import CliRunner
 
-from n2t.runner.cli import run_assembler
+from n2t.infra import HackProgram
+from n2t.runner.cli import cli, run_assembler
 
 _TEST_PROGRAMS = ["empty", "addL", "maxL", "rectL", "pongL", "max", "rect", "pong"]
 
@@ -20,3 +23,72 @@ def test_should_assemble(program: str, asm_directory: Path) -> None:
         f1=str(asm_directory.joinpath(f"{program}.cmp")),
         f2=str(asm_directory.joinpath(f"{program}.hack")),
     )
+
+
+@pytest.mark.parametrize("program", ["max", "pong"])
+def test_should_assemble_packed(program: str, asm_directory: Path) -> None:
+    asm_file = asm_directory.joinpath(f"{program}.asm")
+
+    result = CliRunner().invoke(cli, ["assemble", str(asm_file), "--packed"])
+
+    assert result.exit_code == 0, result.output
+    rom_file = asm_file.with_suffix(".rom")
+    words = list(HackProgram(rom_file))
+    rom_file.unlink()
+    assert words == asm_directory.joinpath(f"{program}.cmp").read_text().split()
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_should_assemble_directory(
+    jobs: str, asm_directory: Path, tmp_path: Path
+) -> None:
+    for program in _TEST_PROGRAMS:
+        shutil.copy(asm_directory.joinpath(f"{program}.asm"), tmp_path)
+    tmp_path.joinpath("nested").mkdir()
+    tmp_path.joinpath("nested", "broken.asm").write_text("@0\nD=Q\n")
+
+    result = CliRunner().invoke(cli, ["assemble", str(tmp_path), "--jobs", jobs])
+
+    assert result.exit_code == 1
+    assert result.output.splitlines()[1:] == [
+        f"{tmp_path.joinpath('nested', 'broken.asm')}: KeyError: 'Q'",
+        f"Assembled {len(_TEST_PROGRAMS)} of {len(_TEST_PROGRAMS) + 1} files",
+    ]
+    for program in _TEST_PROGRAMS:
+        assert filecmp.cmp(
+            shallow=False,
+            f1=str(asm_directory.joinpath(f"{program}.cmp")),
+            f2=str(tmp_path.joinpath(f"{program}.hack")),
+        )
+
+
+def test_should_assemble_glob_pattern(asm_directory: Path, tmp_path: Path) -> None:
+    for program in _TEST_PROGRAMS:
+        shutil.copy(asm_directory.joinpath(f"{program}.asm"), tmp_path)
+
+    pattern = str(tmp_path.joinpath("*L.asm"))
+    result = CliRunner().invoke(cli, ["assemble", pattern, "--jobs", "0"])
+
+    assert result.exit_code == 0, result.output
+    assert sorted(path.name for path in tmp_path.glob("*.hack")) == [
+        "addL.hack",
+        "maxL.hack",
+        "pongL.hack",
+        "rectL.hack",
+    ]
+
+
+@pytest.mark.parametrize("pattern", ["", "*.asm"])
+def test_should_fail_when_nothing_matches(pattern: str, tmp_path: Path) -> None:
+    target = str(tmp_path.joinpath(pattern))
+
+    result = CliRunner().invoke(cli, ["assemble", target])
+
+    assert result.exit_code == 1
+    assert result.output.splitlines()[-1] == f"No .asm files match {target}"
+
+
+def test_should_reject_negative_jobs(tmp_path: Path) -> None:
+    result = CliRunner().invoke(cli, ["assemble", str(tmp_path), "--jobs", "-1"])
+
+    assert result.exit_code == 2
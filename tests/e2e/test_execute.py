@@ -0,0 +1,510 @@
+import filecmp
+import shutil
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from n2t.runner.cli import cli, run_vm_translator
+
+_TEST_PROGRAMS = [
+    "Add",
+    "BasicTest",
+    "Max",
+    "MaxL",
+    "PointerTest",
+    "SimpleAdd",
+    "StackTest",
+    "StaticTest",
+    "Rect",
+    "Pong",
+]
+_CYCLES = "10000"
+
+
+def execute(*arguments: str) -> None:
+    result = CliRunner().invoke(cli, ["execute", *arguments])
+
+    assert result.exit_code == 0, result.output
+
+
+@pytest.mark.parametrize("program", _TEST_PROGRAMS)
+@pytest.mark.parametrize("extension", [".asm", ".hack"])
+@pytest.mark.parametrize("jit", [False, True])
+def test_should_execute(
+    program: str, extension: str, jit: bool, cpu_tests_directory: Path, tmp_path: Path
+) -> None:
+    program_file = tmp_path.joinpath(f"{program}{extension}")
+    shutil.copy(cpu_tests_directory.joinpath(f"{program}{extension}"), program_file)
+
+    execute(str(program_file), "--cycles", _CYCLES, "--jit" if jit else "--no-jit")
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        [program_file.name, f"{program}.json"]
+    )
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(cpu_tests_directory.joinpath(f"{program}.json")),
+        f2=str(tmp_path.joinpath(f"{program}.json")),
+    )
+
+
+@pytest.mark.parametrize("program", ["Max", "Pong"])
+def test_should_execute_packed(
+    program: str, cpu_tests_directory: Path, tmp_path: Path
+) -> None:
+    program_file = tmp_path.joinpath(f"{program}.asm")
+    shutil.copy(cpu_tests_directory.joinpath(f"{program}.asm"), program_file)
+    result = CliRunner().invoke(cli, ["assemble", str(program_file), "--packed"])
+    assert result.exit_code == 0, result.output
+
+    execute(str(tmp_path.joinpath(f"{program}.rom")), "--cycles", _CYCLES)
+
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(cpu_tests_directory.joinpath(f"{program}.json")),
+        f2=str(tmp_path.joinpath(f"{program}.json")),
+    )
+
+
+def test_should_execute_packed_round_trip(
+    cpu_tests_directory: Path, tmp_path: Path
+) -> None:
+    program_file = tmp_path.joinpath("Max.asm")
+    shutil.copy(cpu_tests_directory.joinpath("Max.asm"), program_file)
+    result = CliRunner().invoke(cli, ["assemble", str(program_file), "--packed"])
+    assert result.exit_code == 0, result.output
+    program_file.unlink()
+
+    execute(str(tmp_path.joinpath("Max.rom")), "--cycles", _CYCLES, "--round-trip")
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "Max.json",
+        "Max.rom",
+        "Max1.asm",
+    ]
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(cpu_tests_directory.joinpath("Max.json")),
+        f2=str(tmp_path.joinpath("Max.json")),
+    )
+
+
+@pytest.mark.parametrize("program", ["Max", "StackTest"])
+def test_should_execute_round_trip(
+    program: str, cpu_tests_directory: Path, tmp_path: Path
+) -> None:
+    program_file = tmp_path.joinpath(f"{program}.asm")
+    shutil.copy(cpu_tests_directory.joinpath(f"{program}.asm"), program_file)
+
+    execute(str(program_file), "--cycles", _CYCLES, "--round-trip")
+
+    assert tmp_path.joinpath(f"{program}.hack").exists()
+    assert tmp_path.joinpath(f"{program}1.asm").exists()
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(cpu_tests_directory.joinpath(f"{program}.json")),
+        f2=str(tmp_path.joinpath(f"{program}.json")),
+    )
+
+
+@pytest.mark.parametrize("program", ["FibonacciElement", "StaticsTest"])
+def test_should_execute_vm_directory_like_translated_program(
+    program: str, vm_directory: Path, tmp_path: Path
+) -> None:
+    directory = tmp_path.joinpath(program)
+    shutil.copytree(vm_directory.joinpath("FunctionCalls", program), directory)
+
+    execute(str(directory), "--until-halt")
+    shutil.move(str(tmp_path.joinpath(f"{program}.json")), tmp_path.joinpath("vm"))
+    run_vm_translator(str(directory))
+    execute(str(directory.joinpath(f"{program}.asm")), "--until-halt")
+
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(tmp_path.joinpath("vm")),
+        f2=str(directory.joinpath(f"{program}.json")),
+    )
+
+
+_HELLO_MAIN = [
+    "function Main.main 0",
+    "push constant 2",
+    "call String.new 1",
+    "push constant 72",
+    "call String.appendChar 2",
+    "push constant 105",
+    "call String.appendChar 2",
+    "call Output.printString 1",
+    "pop temp 0",
+    "push constant 6",
+    "push constant 7",
+    "call Math.multiply 2",
+    "call Output.printInt 1",
+    "pop temp 0",
+    "push constant 0",
+    "return",
+]
+
+
+def test_should_execute_vm_with_native_os(tmp_path: Path) -> None:
+    directory = tmp_path.joinpath("Hello")
+    directory.mkdir()
+    directory.joinpath("Main.vm").write_text("\n".join(_HELLO_MAIN))
+    directory.joinpath("Sys.vm").write_text(
+        "function Sys.init 0\ncall Main.main 0\npop temp 0\ncall Sys.halt 0\n"
+    )
+
+    result = CliRunner().invoke(
+        cli, ["execute", str(directory), "--until-halt", "--native-os"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Halted after 26 cycles" in result.output
+    assert "Hi42" in result.output
+
+
+def test_should_boot_main_only_directory_with_native_os(tmp_path: Path) -> None:
+    directory = tmp_path.joinpath("Hello")
+    directory.mkdir()
+    directory.joinpath("Main.vm").write_text("\n".join(_HELLO_MAIN))
+
+    result = CliRunner().invoke(
+        cli, ["execute", str(directory), "--until-halt", "--native-os"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Halted after" in result.output
+    assert "Hi42" in result.output
+    assert '"2048": 2048' not in tmp_path.joinpath("Hello.json").read_text()
+
+
+@pytest.mark.parametrize(
+    "file_name, source, report",
+    [
+        ("Halt.asm", "@0\nM=M+1\n(END)\n@END\n0;JMP\n", "Halted after 4 cycles"),
+        ("End.asm", "@0\nM=M+1\n", "Ran off the end of the program after 2 cycles"),
+        (
+            "End.vm",
+            "push constant 1\n",
+            "Ran off the end of the program after 1 cycles",
+        ),
+        (
+            "Loop.asm",
+            "(LOOP)\n@0\nM=M+1\n@LOOP\n0;JMP\n",
+            "Did not halt within 10 cycles",
+        ),
+    ],
+)
+def test_should_report_how_until_halt_stopped(
+    file_name: str, source: str, report: str, tmp_path: Path
+) -> None:
+    program_file = tmp_path.joinpath(file_name)
+    program_file.write_text(source)
+
+    result = CliRunner().invoke(
+        cli,
+        ["execute", str(program_file), "--until-halt", "--max-cycles", "10"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert report in result.output
+
+
+@pytest.mark.parametrize("image_format", ["pbm", "pgm"])
+def test_should_dump_frames(
+    image_format: str, cpu_tests_directory: Path, tmp_path: Path
+) -> None:
+    program_file = tmp_path.joinpath("Pong.asm")
+    shutil.copy(cpu_tests_directory.joinpath("Pong.asm"), program_file)
+
+    execute(
+        str(program_file),
+        "--cycles",
+        _CYCLES,
+        "--frame-every",
+        "4000",
+        "--frame-format",
+        image_format,
+    )
+
+    frames = sorted(tmp_path.glob(f"*.{image_format}"))
+    assert [frame.name for frame in frames] == [
+        f"Pong-4000.{image_format}",
+        f"Pong-8000.{image_format}",
+    ]
+    assert frames[0].read_bytes().startswith(b"P4" if image_format == "pbm" else b"P5")
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(cpu_tests_directory.joinpath("Pong.json")),
+        f2=str(tmp_path.joinpath("Pong.json")),
+    )
+
+
+def test_should_play_keyboard_script(tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Echo.asm")
+    program_file.write_text("@24576\nD=M\n@0\nM=D\n@0\n0;JMP\n")
+    keyboard_file = tmp_path.joinpath("keys.txt")
+    keyboard_file.write_text("50 up 10\n80 k\n")
+
+    execute(str(program_file), "--cycles", "120", "--keyboard", str(keyboard_file))
+
+    assert '"0": 75' in tmp_path.joinpath("Echo.json").read_text()
+
+
+def test_should_play_keyboard_script_for_vm(tmp_path: Path) -> None:
+    directory = tmp_path.joinpath("Echo")
+    directory.mkdir()
+    directory.joinpath("Sys.vm").write_text(
+        "function Sys.init 0\npush constant 24576\npop pointer 1\n"
+        "label LOOP\npush that 0\npop static 0\ngoto LOOP\n"
+    )
+    directory.joinpath("Main.vm").write_text("function Main.main 0\n")
+    keyboard_file = tmp_path.joinpath("keys.txt")
+    keyboard_file.write_text("30 k\n")
+
+    execute(str(directory), "--cycles", "60", "--keyboard", str(keyboard_file))
+
+    assert '"16": 75' in tmp_path.joinpath("Echo.json").read_text()
+
+
+@pytest.mark.parametrize("script", [None, "10 shift\n", "ten k\n"])
+def test_should_reject_bad_keyboard_script(script: str | None, tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Echo.asm")
+    program_file.write_text("@24576\nD=M\n@0\nM=D\n@0\n0;JMP\n")
+    keyboard_file = tmp_path.joinpath("keys.txt")
+    if script is not None:
+        keyboard_file.write_text(script)
+
+    result = CliRunner().invoke(
+        cli, ["execute", str(program_file), "--keyboard", str(keyboard_file)]
+    )
+
+    assert result.exit_code == 2
+    assert "Bad keyboard script" in result.output
+
+
+def test_should_write_trace(tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@0\n0;JMP\n")
+
+    execute(str(program_file), "--cycles", "10", "--trace", "3")
+
+    result = CliRunner().invoke(
+        cli, ["trace", str(tmp_path.joinpath("Count.trace")), "--last", "2"]
+    )
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [
+        "3 of 10 instructions (7 older ones dropped)",
+        "    0  A=0      D=0",
+        "    1  A=0      D=0      RAM[0]=3",
+    ]
+
+
+def test_should_stop_at_time_limit(tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@0\n0;JMP\n")
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "execute",
+            str(program_file),
+            "--cycles",
+            "1000000000",
+            "--max-seconds",
+            "0.2",
+            "--progress-every",
+            "1",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Stopped at the 0.2s time limit" in result.output
+    assert "cycles/s), peak RSS" in result.output
+    assert tmp_path.joinpath("Count.json").exists()
+
+
+def test_should_dump_changed_cells(tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@0\n0;JMP\n")
+
+    execute(str(program_file), "--cycles", "20", "--dump-every", "6")
+
+    assert tmp_path.joinpath("Count.jsonl").read_text().splitlines() == [
+        '{"cycle": 6, "RAM": {"0": 2}}',
+        '{"cycle": 12, "RAM": {"0": 3}}',
+        '{"cycle": 18, "RAM": {"0": 5}}',
+    ]
+
+
+def test_should_dump_selected_ranges(tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@300\nM=1\n@0\n0;JMP\n")
+
+    execute(str(program_file), "--cycles", "20", "--dump", "256-2047")
+
+    assert tmp_path.joinpath("Count.json").read_text().splitlines() == [
+        "{",
+        '  "RAM": {',
+        '    "300": 1',
+        "  }",
+        "}",
+    ]
+
+
+def test_should_dump_binary_ram(tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@0\n0;JMP\n")
+
+    execute(str(program_file), "--cycles", "20", "--ram-format", "bin")
+    execute(str(program_file), "--cycles", "20", "--ram-format", "npy")
+
+    image = tmp_path.joinpath("Count.bin").read_bytes()
+    array = tmp_path.joinpath("Count.npy").read_bytes()
+    assert len(image) == 65536 and image[:2] == bytes([5, 0])
+    assert array.startswith(b"\x93NUMPY\x01\x00")
+    assert b"'descr': '<i2'" in array and b"'shape': (32768,)" in array
+    assert (len(array) - len(image)) % 64 == 0 and array.endswith(image)
+    assert not tmp_path.joinpath("Count.json").exists()
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--ram-format", "asm"],
+        ["--ram-format", "bin", "--dump", "0-15"],
+        ["--ram-format", "npy", "--dump", "0-15"],
+    ],
+)
+def test_should_reject_bad_ram_formats(option: list[str], tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@0\n0;JMP\n")
+
+    result = CliRunner().invoke(cli, ["execute", str(program_file), *option])
+
+    assert result.exit_code == 2
+    assert program_file.read_text() == "@0\nM=M+1\n@0\n0;JMP\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["Count.asm"]
+
+
+def test_should_keep_ram_in_shared_memory(tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@0\n0;JMP\n")
+    segment = f"n2t-test-{tmp_path.name}"
+
+    execute(str(program_file), "--cycles", "20", "--ram-format", "bin")
+    execute(str(program_file), "--cycles", "20", "--ram-file", str(tmp_path / "ram"))
+    execute(str(program_file), "--cycles", "20", "--ram-segment", segment)
+
+    image = tmp_path.joinpath("Count.bin").read_bytes()
+    assert tmp_path.joinpath("ram").read_bytes() == image
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(segment)
+
+
+@pytest.mark.parametrize(
+    "option", ["--frame-every", "--dump-every", "--progress-every"]
+)
+def test_should_reject_non_positive_intervals(option: str, tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@0\n0;JMP\n")
+
+    result = CliRunner().invoke(cli, ["execute", str(program_file), option, "0"])
+
+    assert result.exit_code == 2
+    assert not tmp_path.joinpath("Count.json").exists()
+
+
+@pytest.mark.parametrize("option", ["--ram-file", "--ram-segment"])
+def test_should_reject_unusable_shared_ram(option: str, tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@0\n0;JMP\n")
+    # the file's directory is missing and the segment already exists
+    segment = SharedMemory(f"n2t-test-{tmp_path.name}", create=True, size=1)
+    target = (
+        str(tmp_path / "missing" / "ram") if option == "--ram-file" else segment.name
+    )
+
+    try:
+        result = CliRunner().invoke(cli, ["execute", str(program_file), option, target])
+    finally:
+        segment.close()
+        segment.unlink()
+
+    assert result.exit_code == 2
+    assert "Cannot set up shared RAM" in result.output
+
+
+def test_should_reject_snapshots_with_native_os(tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@0\n0;JMP\n")
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "execute",
+            str(program_file),
+            "--native-os",
+            "--save-state",
+            str(tmp_path.joinpath("Count.state")),
+        ],
+    )
+
+    assert result.exit_code == 2
+    assert "native Jack OS" in result.output
+    assert not tmp_path.joinpath("Count.state").exists()
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--jit"],
+        ["--profile"],
+        ["--save-state", "Add.state"],
+        ["--resume-from", "Add.state"],
+        ["--trace", "10"],
+        ["--round-trip"],
+    ],
+)
+def test_should_reject_cpu_options_for_vm(option: list[str], tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Add.vm")
+    program_file.write_text("push constant 1\npush constant 2\nadd\n")
+
+    result = CliRunner().invoke(cli, ["execute", str(program_file), *option])
+
+    assert result.exit_code == 2
+    assert "not supported for VM programs" in result.output
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["Add.vm"]
+
+
+def test_should_dump_vm_frames(tmp_path: Path) -> None:
+    directory = tmp_path.joinpath("Fill")
+    directory.mkdir()
+    directory.joinpath("Sys.vm").write_text(
+        "function Sys.init 0\npush constant 16384\npop pointer 1\n"
+        "push constant 0\nnot\npop that 0\n"
+        "label LOOP\npush static 0\npop static 0\ngoto LOOP\n"
+    )
+    directory.joinpath("Main.vm").write_text("function Main.main 0\n")
+
+    execute(str(directory), "--cycles", "20", "--frame-every", "10")
+
+    frames = sorted(path.name for path in tmp_path.glob("*.pbm"))
+    assert frames == ["Fill-10.pbm", "Fill-20.pbm"]
+    pixels = tmp_path.joinpath("Fill-20.pbm").read_bytes().split(b"\n", 2)[2]
+    assert pixels[:3] == b"\xff\xff\x00"
+
+
+def test_should_reject_unknown_frame_format(tmp_path: Path) -> None:
+    program_file = tmp_path.joinpath("Count.asm")
+    program_file.write_text("@0\nM=M+1\n@0\n0;JMP\n")
+
+    result = CliRunner().invoke(
+        cli,
+        ["execute", str(program_file), "--frame-every", "2", "--frame-format", "xml"],
+    )
+
+    assert result.exit_code == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["Count.asm"]
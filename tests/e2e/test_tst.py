@@ -0,0 +1,30 @@
+import shutil
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from n2t.runner.cli import cli
+
+
+def test_should_run_script_without_output(cpu_tests_directory: Path) -> None:
+    result = CliRunner().invoke(
+        cli, ["test", str(cpu_tests_directory.joinpath("testfile.tst"))]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Comparison ended successfully" in result.output
+
+
+def test_should_report_comparison_failure(vm_directory: Path, tmp_path: Path) -> None:
+    directory = tmp_path.joinpath("SimpleAdd")
+    shutil.copytree(vm_directory.joinpath("StackArithmetic", "SimpleAdd"), directory)
+    shutil.copy(Path(__file__).parent.joinpath("cpu_tests", "SimpleAdd.asm"), directory)
+    directory.joinpath("SimpleAdd.cmp").write_text(
+        "|  RAM[0]  | RAM[256] |\n|    257   |      0   |\n"
+    )
+
+    result = CliRunner().invoke(cli, ["test", str(directory.joinpath("SimpleAdd.tst"))])
+
+    assert result.exit_code == 1
+    assert "Comparison failure at line 2" in result.output
+    assert directory.joinpath("SimpleAdd.out").exists()
@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest
 
-from tests.e2e.conftest import run_vm_translator_test
+from tests.e2e.conftest import run_vm_translator_native_test, run_vm_translator_test
 
 _TEST_PROGRAMS = [
     ("FunctionCalls", "SimpleFunction"),
@@ -39,3 +39,12 @@ def test_run_emulator_sh(
     test_file: tuple[str, str], cpu_emulator_sh: Path, projects_directory: Path
 ) -> None:
     run_for_all_os(test_file, cpu_emulator_sh, projects_directory)
+
+
+@pytest.mark.parametrize("test_file", _TEST_PROGRAMS)
+def test_run_native(
+    test_file: tuple[str, str], vm_directory: Path, tmp_path: Path
+) -> None:
+    run_vm_translator_native_test(
+        vm_directory, tmp_path, test_file, test_file[1] + ".vm"
+    )
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from hypothesis import given
+from hypothesis.strategies import integers, sampled_from
+
+from n2t.core.assembler.code import COMP_MAP
+from n2t.core.cpu_emulator.alu import ALU, to_word
+
+words = integers(min_value=-32768, max_value=32767)
+
+
+def test_should_cover_every_computation() -> None:
+    assert set(ALU) == {int(bits, base=2) for bits in COMP_MAP.values()}
+
+
+@given(name=sampled_from(sorted(COMP_MAP)), a=words, d=words, m=words)
+def test_should_compute_like_hack_alu(name: str, a: int, d: int, m: int) -> None:
+    expected = to_word(eval(name.replace("!", "~"), {"A": a, "D": d, "M": m}))
+
+    assert ALU[int(COMP_MAP[name], base=2)](a, d, m) == expected
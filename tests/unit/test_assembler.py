@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+from n2t.core import Assembler
+from n2t.core.assembler.code import (
+    COMP_MAP,
+    DEST_MAP,
+    ENCODING_CACHE_SIZE,
+    JUMP_MAP,
+    encode_c_instruction,
+)
+
+_PROGRAM = [
+    "@i",
+    "M=1",
+    "(LOOP)",
+    "@END",
+    "0;JMP",
+    "@sum",
+    "M=0",
+    "@LOOP",
+    "0;JMP",
+    "(END)",
+    "@END",
+    "0;JMP",
+    "@i",
+]
+
+
+def once(lines: list[str]) -> Iterator[str]:
+    yield from lines
+
+
+def test_should_read_assembly_once() -> None:
+    words = list(Assembler.create().assemble(once(_PROGRAM)))
+
+    assert [int(word, base=2) for word in words] == [
+        16,
+        0b1110111111001000,
+        8,
+        0b1110101010000111,
+        17,
+        0b1110101010001000,
+        2,
+        0b1110101010000111,
+        8,
+        0b1110101010000111,
+        16,
+    ]
+
+
+def test_should_allocate_variables_in_order_of_first_use() -> None:
+    words = list(Assembler.create().assemble(["@b", "@a", "(a)", "@b", "@c"]))
+
+    assert [int(word, base=2) for word in words] == [16, 2, 16, 17]
+
+
+def test_should_not_share_symbols_between_assemblers() -> None:
+    Assembler.create().assemble(["@KBD", "@x", "(LOOP)", "@LOOP"])
+
+    assembler = Assembler.create()
+    words = list(assembler.assemble(["@y", "@LOOP", "@KBD"]))
+
+    assert [int(word, base=2) for word in words] == [16, 17, 24576]
+    assert assembler.symbol_table.labels == {}
+
+
+def test_should_reset_symbols_between_assemblies() -> None:
+    assembler = Assembler.create()
+    first = list(assembler.assemble(_PROGRAM))
+    list(assembler.assemble(["@other", "(LOOP)", "(END)", "@LOOP"]))
+
+    assert list(assembler.assemble(_PROGRAM)) == first
+    assert assembler.symbol_table.labels == {"LOOP": 2, "END": 8}
+
+
+def test_should_encode_c_instructions_from_a_bounded_cache() -> None:
+    assert encode_c_instruction("  AM=M+1;JGT // next") == 0b1111110111101001
+    assert encode_c_instruction("AM=M+1;JGT") == 0b1111110111101001
+
+    for destination in DEST_MAP:
+        for computation in COMP_MAP:
+            for jmp in JUMP_MAP:
+                encode_c_instruction(f"{destination}={computation};{jmp}")
+
+    assert encode_c_instruction.cache_info().currsize == ENCODING_CACHE_SIZE
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists, tuples
+
+from n2t.core.cpu_emulator.decoder import decode
+from n2t.core.cpu_emulator.facade import Emulator
+
+pytest.importorskip("numpy")
+
+from n2t.core.cpu_emulator.batch import BatchEmulator  # noqa: E402
+
+# R2 = max(R0, R1), then R3 = R2 + (R2 - 1) + ... + 1
+_PROGRAM = decode(
+    [
+        "@0",
+        "D=M",
+        "@1",
+        "D=D-M",
+        "@10",
+        "D;JGT",
+        "@1",
+        "D=M",
+        "@12",
+        "0;JMP",
+        "@0",
+        "D=M",
+        "@2",
+        "M=D",
+        "@2",
+        "D=M",
+        "@24",
+        "D;JLE",
+        "@3",
+        "M=M+D",
+        "@2",
+        "M=M-1",
+        "@14",
+        "0;JMP",
+        "@24",
+        "0;JMP",
+    ]
+)
+
+words = integers(min_value=-20, max_value=20)
+
+
+@settings(deadline=None)
+@given(
+    states=lists(tuples(words, words), min_size=1, max_size=8),
+    cycles=integers(min_value=0, max_value=300),
+)
+def test_should_match_emulator_per_instance(
+    states: list[tuple[int, int]], cycles: int
+) -> None:
+    batch = BatchEmulator.create([{0: r0, 1: r1} for r0, r1 in states])
+
+    batch.run(_PROGRAM, cycles)
+
+    for (r0, r1), dump in zip(states, batch.dump_rams()):
+        emulator = Emulator.create()
+        emulator.ram.words[0], emulator.ram.words[1] = r0, r1
+        emulator.run(_PROGRAM, cycles)
+        assert dump == emulator.dump_ram()
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from hypothesis import given
+from hypothesis.strategies import one_of
+
+from n2t.core.cpu_emulator.decoder import decode, decode_word
+from tests.unit.strategies import HackAssemblyPair, a_instructions, c_instructions
+
+
+@given(instruction=one_of(a_instructions(), c_instructions()))
+def test_should_decode_assembly_like_words(instruction: HackAssemblyPair) -> None:
+    program = decode([instruction.assembly])
+
+    assert program == [decode_word(int(instruction.hack, base=2))]
+
+
+def test_should_skip_comments_and_blank_lines() -> None:
+    program = decode(["// comment", "", "@5", "D=A // load five"])
+
+    assert program == [decode_word(5), decode_word(0b1110110000010000)]
@@ -3,6 +3,7 @@ from __future__ import annotations
 from hypothesis import given
 from hypothesis.strategies import one_of
 
+from n2t.core.assembler.code import encode_c_instruction
 from n2t.core.disassembler import Disassembler
 from tests.unit.strategies import (
     HackAssemblyPair,
@@ -47,3 +48,13 @@ def test_should_not_fail_fuzzing(hack_word: str) -> None:
     disassembler = Disassembler.create()
 
     disassembler.disassemble_one(word=hack_word)
+
+
+@given(instruction=c_instructions())
+def test_should_round_trip_encoded_instructions(instruction: HackAssemblyPair) -> None:
+    disassembler = Disassembler.create()
+
+    word = encode_c_instruction(instruction.assembly)
+
+    assert f"{word:016b}" == instruction.hack
+    assert disassembler.disassemble_one(f"{word:016b}") == instruction.assembly
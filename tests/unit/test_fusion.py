@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from hypothesis import given
+from hypothesis.strategies import integers, lists, sampled_from
+
+from n2t.core import Assembler, Emulator, VMTranslator
+from n2t.core.assembler.code import COMP_MAP
+from n2t.core.cpu_emulator.decoder import Instruction, decode, decode_words
+from n2t.core.cpu_emulator.fusion import (
+    BINARY,
+    FUSED,
+    POP_A,
+    POP_SEGMENT,
+    PUSH_CONSTANT,
+    PUSH_D,
+    PUSH_SEGMENT,
+    SIZES,
+    fuse,
+)
+
+_COMMANDS = [
+    "push constant 7",
+    "push constant 32767",
+    "push local 1",
+    "push argument 0",
+    "push static 2",
+    "push temp 3",
+    "push pointer 1",
+    "pop local 0",
+    "pop that 2",
+    "pop static 1",
+    "pop temp 0",
+    "pop pointer 0",
+    "add",
+    "sub",
+    "neg",
+    "not",
+    "and",
+    "or",
+    "eq",
+    "lt",
+]
+_RAM = {0: 256, 1: 300, 2: 400, 3: 3000, 4: 4000}
+
+
+def translate(vm_language: list[str]) -> list[Instruction]:
+    translator = VMTranslator.create()
+    translator.set_function_name("Test")
+    assembly = list(translator.translate(vm_language, False))
+    return decode_words(Assembler.create().assemble(assembly))
+
+
+def run(program: list[Instruction], cycles: int, reference: bool) -> Emulator:
+    # the profiler runs the plain instructions, one by one
+    emulator = Emulator.create(profile=reference)
+    for address, value in _RAM.items():
+        emulator.ram[address] = value
+    emulator.run(program, cycles)
+    return emulator
+
+
+def assert_same_state(fused: Emulator, plain: Emulator) -> None:
+    assert fused.ram.words == plain.ram.words
+    assert fused.ram.touched == plain.ram.touched
+    assert (fused.a_register, fused.d_register) == (plain.a_register, plain.d_register)
+    assert (fused.index, fused.pc_register) == (plain.index, plain.pc_register)
+
+
+def test_should_fuse_translated_sequences() -> None:
+    program = translate(["push constant 7", "push local 1", "add", "pop this 2"])
+    fused = fuse(program)
+
+    assert fused[0] == Instruction(FUSED, PUSH_CONSTANT, 7)
+    assert fused[7] == Instruction(FUSED, PUSH_SEGMENT, 1, 1)
+    assert fused[17] == Instruction(FUSED, BINARY, int(COMP_MAP["M+D"], base=2))
+    assert fused[27] == Instruction(FUSED, POP_SEGMENT, 3, 2)
+    assert len(program) == 27 + SIZES[POP_SEGMENT]
+
+
+@given(lists(sampled_from(_COMMANDS), max_size=30), integers(0, 400))
+def test_should_run_like_plain_instructions(
+    vm_language: list[str], cycles: int
+) -> None:
+    program = translate(["push constant 1", "push constant 2", *vm_language])
+
+    assert_same_state(run(program, cycles, False), run(program, cycles, True))
+
+
+@given(integers(0, 4))
+def test_should_run_jumps_into_a_sequence(offset: int) -> None:
+    push = decode(["@0", "A=M", "M=D", "@0", "M=M+1"])
+    jump = decode([f"@{3 + offset}", "D=A", "0;JMP"])
+    program = [*jump, *push, *decode(["@3", "0;JMP"])]
+    assert fuse(program)[3] == Instruction(FUSED, PUSH_D)
+
+    assert_same_state(run(program, 60, False), run(program, 60, True))
+
+
+def test_should_only_touch_stack_pointer_when_popping_into_a() -> None:
+    program = decode(["@0", "M=M-1", "A=M"])
+
+    assert fuse(program)[0] == Instruction(FUSED, POP_A, 0)
+    assert_same_state(run(program, 3, False), run(program, 3, True))
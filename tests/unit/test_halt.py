@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pytest
+
+from n2t.core.cpu_emulator.decoder import decode
+from n2t.core.cpu_emulator.facade import Emulator
+from n2t.core.cpu_emulator.halt import find_halts
+
+
+def test_should_find_canonical_end_loop() -> None:
+    program = decode(["@7", "D=A", "@0", "M=D", "@4", "0;JMP"])
+
+    assert find_halts(program) == {5: 4}
+
+
+def test_should_find_jump_to_self() -> None:
+    program = decode(["@1", "D;JEQ"])
+
+    assert find_halts(program) == {1: 1}
+
+
+def test_should_ignore_loops_with_side_effects() -> None:
+    program = decode(["@0", "M=M+1", "@0", "0;JMP", "@4", "M;JEQ", "@6", "D;JGT"])
+
+    assert find_halts(program) == {7: 6}
+
+
+@pytest.mark.parametrize("jit", [False, True])
+def test_should_stop_on_halt(jit: bool) -> None:
+    emulator = Emulator.create(jit)
+
+    emulator.run(decode(["@7", "D=A", "@0", "M=D", "@4", "0;JMP"]), 1000)
+
+    assert emulator.halted
+    assert emulator.pc_register == 6
+    assert emulator.index == 4
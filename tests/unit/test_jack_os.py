@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers
+
+from n2t.core import Assembler, Emulator, VMEmulator, VMTranslator
+from n2t.core.cpu_emulator.alu import to_word
+from n2t.core.cpu_emulator.memory import Memory
+from n2t.core.jack_os import SYS_INIT, JackOS
+from n2t.core.jack_os.heap import HEAP_BASE
+
+_WORDS = integers(min_value=-32768, max_value=32767)
+
+# Main.main computes 6 * 7 into static 0 through a VM implementation of multiply
+_PROGRAM = [
+    "function Main.main 0",
+    "push constant 6",
+    "push constant 7",
+    "call Math.multiply 2",
+    "pop static 0",
+    "push constant 0",
+    "return",
+    "function Math.multiply 1",
+    "label LOOP",
+    "push argument 1",
+    "push constant 0",
+    "eq",
+    "if-goto DONE",
+    "push local 0",
+    "push argument 0",
+    "add",
+    "pop local 0",
+    "push argument 1",
+    "push constant 1",
+    "sub",
+    "pop argument 1",
+    "goto LOOP",
+    "label DONE",
+    "push local 0",
+    "return",
+]
+
+
+@given(_WORDS, _WORDS)
+def test_should_multiply_and_divide_like_the_jack_os(x: int, y: int) -> None:
+    jack_os = JackOS.create(Memory())
+
+    assert jack_os.math_multiply(x, y) == to_word(x * y)
+    if y:
+        assert jack_os.math_divide(x, y) == to_word(int(x / y))
+    else:
+        assert jack_os.math_divide(x, y) == 0
+        assert jack_os.error == 3
+
+
+def test_should_reuse_freed_heap_blocks() -> None:
+    jack_os = JackOS.create(Memory())
+
+    first = jack_os.memory_alloc(3)
+    second = jack_os.memory_alloc(5)
+    jack_os.memory_de_alloc(first)
+    jack_os.memory_de_alloc(second)
+
+    assert (first, second) == (HEAP_BASE, HEAP_BASE + 3)
+    assert jack_os.memory_alloc(8) == HEAP_BASE
+
+
+def test_should_build_strings_in_the_heap() -> None:
+    jack_os = JackOS.create(Memory())
+
+    string = jack_os.string_new(6)
+    jack_os.string_set_int(string, -123)
+    jack_os.string_append_char(string, ord("4"))
+
+    assert jack_os.text(string) == "-1234"
+    assert jack_os.string_int_value(string) == -1234
+    assert jack_os.string_append_char(string, ord("5")) == string
+    assert jack_os.string_append_char(string, ord("6")) == 0
+    assert jack_os.error == 17
+
+
+def test_should_fill_rectangles_across_words() -> None:
+    ram = Memory()
+    jack_os = JackOS.create(ram)
+
+    jack_os.screen_draw_rectangle(14, 1, 17, 2)
+
+    for row in (16384 + 32, 16384 + 64):
+        assert ram.words[row] == to_word(0b11 << 14)
+        assert ram.words[row + 1] == 0b11
+    assert ram.words[16384] == 0
+
+
+def test_should_print_to_the_console() -> None:
+    jack_os = JackOS.create(Memory())
+
+    jack_os.output_move_cursor(1, 2)
+    jack_os.output_print_int(-42)
+    jack_os.output_println()
+    jack_os.output_print_char(ord("x"))
+
+    assert jack_os.lines()[:3] == ["", "  -42", "x"]
+
+
+def test_should_run_natives_from_vm_code() -> None:
+    emulator = VMEmulator.create(native_os=True)
+
+    emulator.emulate(_PROGRAM, 1000, True, "Main")
+
+    assert emulator.halted
+    assert emulator.ram.words[16] == 42
+    assert emulator.pc_register < 20
+
+
+@pytest.mark.parametrize("jit", [False, True])
+def test_should_run_natives_from_hack_code(jit: bool) -> None:
+    translator = VMTranslator.create()
+    translator.set_function_name("Main")
+    assembler = Assembler.create()
+    assembly = translator.translate(_PROGRAM + SYS_INIT, True)
+    words = assembler.assemble(list(assembly))
+    slow, fast = Emulator.create(), Emulator.create(jit, native_os=True)
+    fast.link(assembler.symbol_table.labels)
+
+    slow.emulate_hack(words, 10_000)
+    fast.emulate_hack(words, 10_000)
+
+    assert slow.halted and fast.halted
+    assert slow.ram.words[16] == fast.ram.words[16] == 42
+    assert slow.ram.words[0] == fast.ram.words[0]
+    assert fast.pc_register < slow.pc_register
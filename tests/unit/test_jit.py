@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from hypothesis import given
+from hypothesis.strategies import integers
+
+from n2t.core.cpu_emulator.decoder import decode
+from n2t.core.cpu_emulator.facade import Emulator
+
+_PROGRAM = decode(
+    [
+        "@10",
+        "D=A",
+        "@0",
+        "M=D",
+        "@1",
+        "M=M+1",
+        "@0",
+        "MD=M-1",
+        "@4",
+        "D;JGT",
+        "@10",
+        "0;JMP",
+    ]
+)
+
+
+@given(cycles=integers(min_value=0, max_value=80))
+def test_should_stop_after_exact_cycle_count(cycles: int) -> None:
+    interpreter = Emulator.create()
+    compiled = Emulator.create(jit=True)
+
+    interpreter.run(_PROGRAM, cycles)
+    compiled.run(_PROGRAM, cycles)
+
+    assert compiled.dump_ram() == interpreter.dump_ram()
+    assert (compiled.a_register, compiled.d_register, compiled.index) == (
+        interpreter.a_register,
+        interpreter.d_register,
+        interpreter.index,
+    )
+    assert compiled.pc_register == interpreter.pc_register
+
+
+def test_should_cache_blocks_by_start_index() -> None:
+    emulator = Emulator.create(jit=True)
+
+    emulator.run(_PROGRAM, 100)
+
+    assert emulator.block_cache is not None
+    assert sorted(emulator.block_cache.blocks) == [0, 4, 10]
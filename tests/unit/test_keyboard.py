@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+
+from n2t.core.cpu_emulator.decoder import decode
+from n2t.core.cpu_emulator.facade import Emulator
+from n2t.core.cpu_emulator.keyboard import Keyboard, KeyEvent
+
+# R0 = KBD, forever
+_PROGRAM = decode(["@24576", "D=M", "@0", "M=D", "@0", "0;JMP"])
+
+
+def test_should_parse_presses_and_releases() -> None:
+    keyboard = Keyboard.parse(
+        """
+        # cycle key [cycles held]
+        500 right 20
+        100 q
+        700 code:65 5
+        800 5
+        900 133
+        """
+    )
+
+    assert keyboard.events == [
+        KeyEvent(100, ord("Q")),
+        KeyEvent(500, 132),
+        KeyEvent(520, 0),
+        KeyEvent(700, 65),
+        KeyEvent(705, 0),
+        KeyEvent(800, ord("5")),
+        KeyEvent(900, 133),
+    ]
+
+
+@pytest.mark.parametrize("script", ["100 b\n0 a 100", "0 a 100\n100 b"])
+def test_should_release_before_pressing_on_the_same_cycle(script: str) -> None:
+    keyboard = Keyboard.parse(script)
+
+    assert keyboard.events[1:] == [KeyEvent(100, 0), KeyEvent(100, ord("B"))]
+
+
+def test_should_reject_unknown_keys() -> None:
+    with pytest.raises(ValueError, match="shift"):
+        Keyboard.parse("10 shift")
+
+
+def test_should_feed_keyboard_register_while_running() -> None:
+    emulator = Emulator.create()
+    emulator.play(Keyboard.parse("12 left 30\n100 x"))
+
+    seen = list()
+    for _ in range(20):
+        emulator.run(_PROGRAM, 6)
+        seen.append(emulator.ram.words[0])
+
+    assert seen[1] == 0
+    assert seen[3] == 130
+    assert seen[7] == 0
+    assert seen[-1] == ord("X")
+    assert not emulator.timers
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from n2t.core.cpu_emulator.decoder import decode
+from n2t.core.cpu_emulator.facade import Emulator
+from n2t.core.cpu_emulator.memory import (
+    RAM_SIZE,
+    Memory,
+    RamDiff,
+    parse_ranges,
+    shared_words,
+)
+
+# R0 counts up and R1 mirrors it into the screen
+_COUNTER = decode(["@0", "M=M+1", "D=M", "@16384", "M=D", "@0", "0;JMP"])
+
+_WRITES = st.lists(
+    st.lists(
+        st.tuples(
+            st.integers(min_value=0, max_value=RAM_SIZE - 1),
+            st.integers(min_value=-32768, max_value=32767),
+        ),
+        max_size=20,
+    ),
+    max_size=5,
+)
+
+
+def test_should_list_only_touched_cells() -> None:
+    memory = Memory()
+
+    memory[24576] = 130
+    memory[0] = -1
+    assert memory[16] == 0
+
+    assert list(memory.items()) == [(0, -1), (16, 0), (24576, 130)]
+    assert len(memory) == 3
+
+
+def test_should_wrap_negative_addresses_into_address_space() -> None:
+    memory = Memory()
+
+    memory[-1] = 7
+
+    assert list(memory.items()) == [(RAM_SIZE - 1, 7)]
+
+
+def test_should_write_json_lines() -> None:
+    memory = Memory()
+    assert list(memory.json_lines()) == ["{", '  "RAM": {', "  }", "}"]
+
+    memory[3], memory[1] = 4, -2
+
+    assert list(memory.json_lines()) == [
+        "{",
+        '  "RAM": {',
+        '    "1": -2,',
+        '    "3": 4',
+        "  }",
+        "}",
+    ]
+
+
+def test_should_report_only_changed_cells() -> None:
+    memory, diff = Memory(), RamDiff()
+    memory[5], memory[300] = 1, 0
+
+    assert diff.changes(memory) == [(5, 1), (300, 0)]
+
+    memory[5], memory[300], memory[301] = 1, 9, 0
+
+    assert diff.changes(memory) == [(300, 9), (301, 0)]
+    assert diff.changes(memory) == []
+
+
+@given(_WRITES)
+def test_should_rebuild_memory_from_changes(
+    checkpoints: list[list[tuple[int, int]]],
+) -> None:
+    memory, diff = Memory(), RamDiff()
+    rebuilt: dict[int, int] = dict()
+
+    for writes in checkpoints:
+        for address, value in writes:
+            memory[address] = value
+        rebuilt.update(diff.changes(memory))
+
+    assert sorted(rebuilt.items()) == list(memory.items())
+
+
+def test_should_write_only_selected_ranges() -> None:
+    memory = Memory()
+    for address in (0, 7, 300, 20000):
+        memory[address] = address
+
+    lines = list(memory.json_lines([range(5, 10), range(20000, 20001)]))
+
+    assert lines[2:4] == ['    "7": 7,', '    "20000": 20000']
+
+
+def test_should_write_little_endian_image() -> None:
+    memory = Memory()
+    memory[1], memory[RAM_SIZE - 1] = 258, -1
+
+    image = memory.image()
+
+    assert len(image) == 2 * RAM_SIZE
+    assert image[:4] == bytes([0, 0, 2, 1])
+    assert image[-2:] == bytes([255, 255])
+
+
+def test_should_parse_and_merge_ranges() -> None:
+    assert parse_ranges("256-2047, 0-15,10-20,5") == [range(0, 21), range(256, 2048)]
+    assert parse_ranges("24576") == [range(24576, 24577)]
+    for text in ("15-0", "0-32768", "a-b", ""):
+        with pytest.raises(ValueError):
+            parse_ranges(text)
+
+
+def test_should_run_on_shared_words() -> None:
+    buffer = bytearray(2 * RAM_SIZE)
+    emulator = Emulator.create(jit=True, ram=Memory(shared_words(buffer)))
+    private = Emulator.create(jit=True)
+
+    emulator.run(_COUNTER, 101)
+    private.run(_COUNTER, 101)
+
+    assert buffer == private.ram.image()
+    assert emulator.dump_ram() == private.dump_ram()
+
+
+def test_should_reject_shared_buffer_of_wrong_size() -> None:
+    with pytest.raises(ValueError):
+        shared_words(bytearray(2 * RAM_SIZE + 2))
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from n2t.core.cpu_emulator.decoder import decode
+from n2t.core.cpu_emulator.facade import Emulator
+
+# R0 = 3, then count R0 down to zero in LOOP and halt in END
+_PROGRAM = decode(
+    ["@3", "D=A", "@0", "M=D", "@0", "MD=M-1", "@4", "D;JGT", "@8", "0;JMP"]
+)
+_LABELS = {"LOOP": 4, "END": 8}
+
+
+def test_should_count_executions_and_taken_jumps() -> None:
+    emulator = Emulator.create(profile=True)
+
+    emulator.run(_PROGRAM, 1000)
+
+    assert emulator.profile is not None
+    assert emulator.profile.executions == [1, 1, 1, 1, 3, 3, 3, 3, 1, 1]
+    assert emulator.profile.jumps_taken[7] == 2
+    assert emulator.profile.jumps_taken[9] == 1
+
+
+def test_should_attribute_report_to_labels() -> None:
+    emulator = Emulator.create(profile=True)
+
+    emulator.run(_PROGRAM, 1000)
+    report = emulator.profile_report(_LABELS)
+
+    assert report[1].split() == ["LOOP", "12", "66.67%"]
+    assert report[2].split() == ["-", "4", "22.22%"]
+    assert report[3].split() == ["END", "2", "11.11%"]
+    assert report[9].split() == ["7", "LOOP+3", "3", "16.67%", "2"]
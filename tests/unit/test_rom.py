@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, lists
+
+from n2t.core.cpu_emulator import rom
+
+
+@given(words=lists(integers(min_value=0, max_value=0xFFFF), max_size=64))
+def test_should_round_trip_words(words: list[int]) -> None:
+    assert list(rom.unpack(rom.pack(words))) == words
+
+
+def test_should_store_big_endian_words_after_header(tmp_path: Path) -> None:
+    np = pytest.importorskip("numpy")
+    rom_file = tmp_path.joinpath("Program.rom")
+    rom_file.write_bytes(rom.pack([2, 0xEC10]))
+
+    words = np.fromfile(rom_file, dtype=">u2", offset=rom.HEADER.size)
+
+    assert rom_file.read_bytes()[rom.HEADER.size :] == b"\x00\x02\xec\x10"
+    assert words.tolist() == [2, 0xEC10]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"0000000000\x00\x02",
+        rom.pack([1, 2])[:-1],
+        rom.pack([1, 2]) + b"\x00\x03",
+    ],
+)
+def test_should_reject_malformed_data(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        rom.unpack(data)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from array import array
+
+from hypothesis import given
+from hypothesis.strategies import integers, lists
+
+from n2t.core.cpu_emulator.memory import SCREEN, Memory
+from n2t.core.cpu_emulator.screen import HEIGHT, WIDTH, pbm, pgm
+
+_PBM_HEADER = b"P4\n512 256\n"
+_PGM_HEADER = b"P5\n512 256\n255\n"
+
+
+def test_should_view_screen_without_copying() -> None:
+    ram = Memory()
+    screen = ram.screen
+
+    ram[SCREEN + 1] = 7
+
+    assert len(screen) == WIDTH * HEIGHT // 16
+    assert screen[1] == 7
+
+
+def test_should_encode_leftmost_pixel_first() -> None:
+    ram = Memory()
+    ram[SCREEN] = 0b1
+    ram[SCREEN + 32] = -0x8000
+
+    image = pbm(ram.screen)[len(_PBM_HEADER) :]
+
+    assert image[0] == 0b10000000
+    assert image[64 + 1] == 0b00000001
+    assert sum(image) == 0b10000001
+
+
+@given(lists(integers(min_value=-32768, max_value=32767), min_size=32, max_size=32))
+def test_should_encode_same_pixels_in_both_formats(row: list[int]) -> None:
+    ram = Memory()
+    ram.words[SCREEN : SCREEN + 32] = array("h", row)
+
+    bitmap = pbm(ram.screen)[len(_PBM_HEADER) :]
+    graymap = pgm(ram.screen)[len(_PGM_HEADER) :]
+
+    assert len(graymap) == WIDTH * HEIGHT
+    for x in range(WIDTH):
+        black = row[x // 16] >> (x % 16) & 1
+        assert bitmap[x // 8] >> (7 - x % 8) & 1 == black
+        assert graymap[x] == (0 if black else 255)
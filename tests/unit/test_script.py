@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from hypothesis import given
+from hypothesis.strategies import integers
+
+from n2t.core import Assembler
+from n2t.core.script.facade import ScriptRunner, compare
+from n2t.core.script.parser import Column, Command, parse, parse_column
+
+# R2 = R0 + R1
+_WORDS = [
+    "0000000000000000",
+    "1111110000010000",
+    "0000000000000001",
+    "1111000010010000",
+    "0000000000000010",
+    "1110001100001000",
+]
+_SCRIPT = """
+// adds two numbers
+load Add.hack,
+output-file Add.out,
+compare-to Add.cmp,
+output-list RAM[0]%D2.6.2 RAM[1]%X1.4.1 RAM[2]%D1.6.1 time;
+
+set RAM[0] 2, set RAM[1] 3,
+repeat 6 { ticktock; }
+output;
+"""
+
+
+# R2 = R0 * R1, then loop at END
+_MULT = [
+    "@2", "M=0",
+    "(LOOP)",
+    "@1", "D=M", "@END", "D;JEQ",
+    "@0", "D=M", "@2", "M=M+D",
+    "@1", "M=M-1",
+    "@LOOP", "0;JMP",
+    "(END)",
+    "@END", "0;JMP",
+]  # fmt: skip
+
+
+def test_should_parse_nested_commands() -> None:
+    commands = parse("load X.asm, /* block */ repeat 2 { tick; tock; } output;")
+
+    assert commands == [
+        Command("load", ("X.asm",)),
+        Command("repeat", ("2",), (Command("tick"), Command("tock"))),
+        Command("output"),
+    ]
+
+
+def test_should_parse_column() -> None:
+    assert parse_column("RAM[256]%B3.16.1") == Column("RAM[256]", "B", 3, 16, 1)
+    assert parse_column("time") == Column("time")
+
+
+def test_should_run_script() -> None:
+    runner = ScriptRunner.create(lambda _: _WORDS)
+
+    output = runner.run(_SCRIPT)
+
+    assert output == [
+        "|  RAM[0]  |RAM[1]| RAM[2] |  time  |",
+        "|       2  | 0003 |      5 |      6 |",
+    ]
+    assert runner.output_file == "Add.out"
+    assert runner.compare_to == "Add.cmp"
+
+
+@given(integers(min_value=-32768, max_value=32767))
+def test_should_format_set_values(value: int) -> None:
+    runner = ScriptRunner.create(lambda _: _WORDS)
+
+    output = runner.run(f"load Add.hack, output-list D%D1.6.1; set D {value}, output;")
+
+    assert output[1] == f"| {value:>6} |"
+
+
+def test_should_compare_with_wildcards() -> None:
+    assert compare(["|  1 |  2 |"], ["|  1 |  * |"]) is None
+    assert compare(["|  1 |  2 |", "|  3 |"], ["|  1 |  2 |", "|  4 |"]) == 2
+    assert compare(["|  1 |"], ["|  1 |", "|  2 |"]) == 2
+
+
+def test_should_run_again_after_setting_pc() -> None:
+    words = list(Assembler.create().assemble(_MULT))
+    runner = ScriptRunner.create(lambda _: words)
+    run = "repeat 100 { ticktock; } output;"
+
+    output = runner.run(
+        "load Mult.hack, output-list RAM[0]%D1.4.1 RAM[1]%D1.4.1 RAM[2]%D1.4.1 time;"
+        f"set RAM[0] 3, set RAM[1] 2, set RAM[2] -1, {run}"
+        f"set PC 0, set RAM[0] 4, set RAM[1] 5, set RAM[2] -1, {run}"
+    )
+
+    assert output[1:] == [
+        "|    3 |    0 |    6 |    100 |",
+        "|    4 |    0 |   20 |    200 |",
+    ]
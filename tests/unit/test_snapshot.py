@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers
+
+from n2t.core.cpu_emulator.decoder import decode
+from n2t.core.cpu_emulator.facade import Emulator
+
+# R1 = R1 + 2 * R0 for R0 = 5 down to 1, then halt
+_PROGRAM = decode(
+    [
+        "@5",
+        "D=A",
+        "@0",
+        "M=D",
+        "@0",
+        "D=M",
+        "@1",
+        "M=M+D",
+        "M=M+D",
+        "@0",
+        "MD=M-1",
+        "@4",
+        "D;JGT",
+        "@13",
+        "0;JMP",
+    ]
+)
+
+
+@given(split=integers(min_value=0, max_value=60))
+def test_should_resume_where_snapshot_was_taken(split: int) -> None:
+    whole = Emulator.create()
+    whole.run(_PROGRAM, 60)
+
+    first = Emulator.create()
+    first.run(_PROGRAM, split)
+    second = Emulator.create(jit=True)
+    second.restore(first.snapshot())
+    second.run(_PROGRAM, 60 - split)
+
+    assert second.dump_ram() == whole.dump_ram()
+    assert second.snapshot() == whole.snapshot()
+
+
+def test_should_reject_snapshot_of_another_program() -> None:
+    emulator = Emulator.create()
+    emulator.run(_PROGRAM, 10)
+
+    resumed = Emulator.create()
+    resumed.restore(emulator.snapshot())
+
+    with pytest.raises(ValueError):
+        resumed.run(decode(["@0", "0;JMP"]), 10)
+
+
+def test_should_reject_foreign_data() -> None:
+    with pytest.raises(ValueError):
+        Emulator.create().restore(b"\0" * 64)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from n2t.core.cpu_emulator.decoder import decode
+from n2t.core.cpu_emulator.facade import Emulator
+
+# R0 counts up forever
+_PROGRAM = decode(["@0", "M=M+1", "@0", "0;JMP"])
+
+
+def test_should_fire_timers_at_their_cycles() -> None:
+    emulator = Emulator.create()
+    fired: list[int] = list()
+
+    def every_ten() -> int:
+        fired.append(emulator.pc_register)
+        return emulator.pc_register + 10
+
+    emulator.schedule(5, every_ten)
+    emulator.run(_PROGRAM, 40)
+
+    assert fired == [5, 15, 25, 35]
+    assert emulator.pc_register == 40
+
+
+def test_should_run_the_same_with_and_without_timers() -> None:
+    plain, timed = Emulator.create(jit=True), Emulator.create(jit=True)
+    timed.schedule(3, lambda: None)
+    timed.schedule(7, lambda: timed.pc_register + 1)
+
+    plain.run(_PROGRAM, 100)
+    timed.run(_PROGRAM, 100)
+
+    assert timed.ram.words == plain.ram.words
+    assert timed.index == plain.index
+    assert len(timed.timers) == 1
+
+
+def test_should_stop_from_a_timer() -> None:
+    emulator = Emulator.create()
+    emulator.schedule(10, emulator.stop)
+
+    emulator.run(_PROGRAM, 100)
+
+    assert emulator.stopped and not emulator.halted
+    assert emulator.pc_register == 10
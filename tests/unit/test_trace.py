@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from n2t.core.cpu_emulator.decoder import decode
+from n2t.core.cpu_emulator.facade import Emulator
+from n2t.core.cpu_emulator.trace import Trace, TraceRecord
+
+# R0 counts up forever
+_PROGRAM = decode(["@0", "M=M+1", "@0", "0;JMP"])
+
+
+def test_should_record_every_instruction() -> None:
+    emulator = Emulator.create(trace=10)
+    emulator.run(_PROGRAM, 6)
+
+    assert emulator.trace is not None
+    assert list(emulator.trace) == [
+        TraceRecord(0, 0, 0, None, None),
+        TraceRecord(1, 0, 0, 0, 1),
+        TraceRecord(2, 0, 0, None, None),
+        TraceRecord(3, 0, 0, None, None),
+        TraceRecord(0, 0, 0, None, None),
+        TraceRecord(1, 0, 0, 0, 2),
+    ]
+
+
+@given(st.integers(min_value=1, max_value=50), st.integers(min_value=0, max_value=200))
+def test_should_keep_only_the_last_records(capacity: int, cycles: int) -> None:
+    traced = Emulator.create(trace=capacity)
+    traced.run(_PROGRAM, cycles)
+    full = Emulator.create(trace=cycles + 1)
+    full.run(_PROGRAM, cycles)
+
+    assert traced.trace is not None and full.trace is not None
+    assert len(traced.trace.records) == 5 * capacity
+    assert traced.trace.recorded == cycles
+    assert list(traced.trace) == list(full.trace)[max(0, cycles - capacity) :]
+
+
+@given(st.integers(min_value=1, max_value=20), st.integers(min_value=0, max_value=60))
+def test_should_round_trip_through_bytes(capacity: int, cycles: int) -> None:
+    emulator = Emulator.create(trace=capacity)
+    emulator.run(_PROGRAM, cycles)
+    assert emulator.trace is not None
+
+    trace = Trace.from_bytes(emulator.trace.to_bytes())
+
+    assert trace.recorded == cycles
+    assert list(trace) == list(emulator.trace)
+
+
+def test_should_run_the_same_with_and_without_trace() -> None:
+    plain, traced = Emulator.create(jit=True), Emulator.create(trace=3)
+    plain.run(_PROGRAM, 101)
+    traced.run(_PROGRAM, 101)
+
+    assert traced.ram.words == plain.ram.words
+    assert traced.index == plain.index
+
+
+def test_should_reject_bad_traces() -> None:
+    data = Trace.create(4).to_bytes()
+    with pytest.raises(ValueError):
+        Trace.from_bytes(b"HACK" + data[4:])
+    with pytest.raises(ValueError):
+        Trace.from_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        Trace.create(0)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, sampled_from
+
+from n2t.core import Assembler, Emulator, VMEmulator, VMTranslator
+from n2t.core.vm_emulator.loader import load
+
+_WORDS = integers(min_value=-32768, max_value=32767)
+_COMMANDS = ["add", "sub", "neg", "eq", "gt", "lt", "and", "or", "not"]
+
+
+def emulate_translated(vm_language: list[str], ram: dict[int, int]) -> list[str]:
+    translator = VMTranslator.create()
+    translator.set_function_name("Test")
+    assembly = list(translator.translate(vm_language, False))
+    emulator = Emulator.create()
+    for address, value in ram.items():
+        emulator.ram[address] = value
+    return list(emulator.emulate_hack(Assembler.create().assemble(assembly), 100_000))
+
+
+def emulate_vm(vm_language: list[str], ram: dict[int, int]) -> list[str]:
+    emulator = VMEmulator.create()
+    for address, value in ram.items():
+        emulator.ram[address] = value
+    return list(emulator.emulate(vm_language, 100_000, False, "Test"))
+
+
+@given(_WORDS, _WORDS, sampled_from(_COMMANDS))
+def test_should_compute_like_translated_program(x: int, y: int, command: str) -> None:
+    vm_language = ["push temp 0", "push temp 1", command, "pop static 0"]
+    ram = {0: 256, 5: x, 6: y}
+
+    assert emulate_vm(vm_language, ram) == emulate_translated(vm_language, ram)
+
+
+def test_should_call_functions_like_translated_program() -> None:
+    vm_language = [
+        "function Sys.init 1",
+        "push constant 5",
+        "call Sys.triple 1",
+        "pop local 0",
+        "push local 0",
+        "pop static 0",
+        "label END",
+        "goto END",
+        "function Sys.triple 1",
+        "push argument 0",
+        "pop local 0",
+        "push local 0",
+        "push argument 0",
+        "add",
+        "push local 0",
+        "add",
+        "return",
+    ]
+
+    ram = {0: 256, 1: 300, 2: 400}
+
+    assert emulate_vm(vm_language, ram) == emulate_translated(vm_language, ram)
+
+
+def test_should_halt_on_jump_to_itself() -> None:
+    emulator = VMEmulator.create()
+
+    emulator.emulate(["label END", "goto END", "push constant 1"], 100)
+
+    assert emulator.halted
+    assert emulator.pc_register == 1
+
+
+def test_should_reject_undefined_functions() -> None:
+    with pytest.raises(ValueError, match="Math.multiply"):
+        load(["call Math.multiply 2"])
+
+
+def test_should_fire_timers_between_commands() -> None:
+    emulator = VMEmulator.create()
+    counts: list[int] = list()
+
+    def every_five() -> int | None:
+        counts.append(emulator.pc_register)
+        if len(counts) == 3:
+            emulator.stop()
+            return None
+        return emulator.pc_register + 5
+
+    emulator.schedule(5, every_five)
+    emulator.run(
+        load(["label LOOP", "push constant 1", "pop temp 0", "goto LOOP"]), 100
+    )
+
+    assert counts == [5, 10, 15]
+    assert emulator.pc_register == 15 and not emulator.halted